@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Module for calculating matrix determinant"""
+lu_determinant = __import__('lu_decomposition').determinant
 
 
 def determinant(matrix):
@@ -21,17 +22,4 @@ def determinant(matrix):
     if not all(len(row) == n for row in matrix):
         raise ValueError("matrix must be a square matrix")
 
-    if n == 1:
-        return matrix[0][0]
-
-    if n == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    det = 0
-    for j in range(n):
-        submatrix = [[matrix[i][k] for k in range(n) if k != j]
-                     for i in range(1, n)]
-        sign = (-1) ** j
-        det += sign * matrix[0][j] * determinant(submatrix)
-
-    return det
+    return lu_determinant(matrix)
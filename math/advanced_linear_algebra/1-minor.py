@@ -1,23 +1,6 @@
 #!/usr/bin/env python3
 """Module for calculating minor matrix"""
-
-
-def determinant(matrix):
-    """Calculate the determinant of a matrix"""
-    if len(matrix) == 1:
-        return matrix[0][0]
-
-    if len(matrix) == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    det = 0
-    for j in range(len(matrix)):
-        submatrix = [[matrix[i][k] for k in range(len(matrix)) if k != j]
-                     for i in range(1, len(matrix))]
-        sign = (-1) ** j
-        det += sign * matrix[0][j] * determinant(submatrix)
-
-    return det
+lu_adjugate = __import__('lu_decomposition').adjugate
 
 
 def minor(matrix):
@@ -39,13 +22,16 @@ def minor(matrix):
     if n == 1:
         return [[1]]
 
+    # Every minor is a signed entry of the adjugate, which is computed
+    # from a single factorization
+    adj = lu_adjugate(matrix)
+
     minor_matrix = []
     for i in range(n):
         minor_row = []
         for j in range(n):
-            submatrix = [[matrix[r][c] for c in range(n) if c != j]
-                         for r in range(n) if r != i]
-            minor_row.append(determinant(submatrix))
+            sign = (-1) ** (i + j)
+            minor_row.append(sign * adj[j][i])
         minor_matrix.append(minor_row)
 
     return minor_matrix
@@ -1,42 +1,6 @@
 #!/usr/bin/env python3
 """Module for calculating cofactor matrix"""
-
-
-def determinant(matrix):
-    """Calculate the determinant of a matrix"""
-    if len(matrix) == 1:
-        return matrix[0][0]
-
-    if len(matrix) == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    det = 0
-    for j in range(len(matrix)):
-        submatrix = [[matrix[i][k] for k in range(len(matrix)) if k != j]
-                     for i in range(1, len(matrix))]
-        sign = (-1) ** j
-        det += sign * matrix[0][j] * determinant(submatrix)
-
-    return det
-
-
-def minor(matrix):
-    """Calculate the minor matrix of a matrix"""
-    n = len(matrix)
-
-    if n == 1:
-        return [[1]]
-
-    minor_matrix = []
-    for i in range(n):
-        minor_row = []
-        for j in range(n):
-            submatrix = [[matrix[r][c] for c in range(n) if c != j]
-                         for r in range(n) if r != i]
-            minor_row.append(determinant(submatrix))
-        minor_matrix.append(minor_row)
-
-    return minor_matrix
+lu_adjugate = __import__('lu_decomposition').adjugate
 
 
 def cofactor(matrix):
@@ -55,14 +19,10 @@ def cofactor(matrix):
     if not all(len(row) == n for row in matrix):
         raise ValueError("matrix must be a non-empty square matrix")
 
-    minor_matrix = minor(matrix)
+    # The cofactor matrix is the transpose of the adjugate, which is
+    # computed from a single factorization
+    adj = lu_adjugate(matrix)
 
-    cofactor_matrix = []
-    for i in range(n):
-        cofactor_row = []
-        for j in range(n):
-            sign = (-1) ** (i + j)
-            cofactor_row.append(sign * minor_matrix[i][j])
-        cofactor_matrix.append(cofactor_row)
+    cofactor_matrix = [[adj[j][i] for j in range(n)] for i in range(n)]
 
     return cofactor_matrix
@@ -3,36 +3,63 @@
 import numpy as np
 
 
-def definiteness(matrix):
-    """Calculate the definiteness of a matrix"""
+def definiteness(matrix, tol=None):
+    """
+    Calculate the definiteness of a matrix or of a stack of matrices
+
+    Args:
+        matrix: numpy.ndarray of shape (n, n), or (..., n, n) for a stack
+        tol: eigenvalues with an absolute value up to tol count as zero;
+             None uses n * eps * ||A||_F for each matrix A
+
+    Returns:
+        The definiteness as a string, or None if the matrix is not a
+        valid symmetric matrix; for a stack, a numpy.ndarray of shape
+        (...) holding one such value per matrix
+    """
     if not isinstance(matrix, np.ndarray):
         raise TypeError("matrix must be a numpy.ndarray")
 
-    if len(matrix.shape) != 2:
+    if len(matrix.shape) < 2:
         return None
 
-    n, m = matrix.shape
+    n, m = matrix.shape[-2:]
 
     if n != m or n == 0:
         return None
 
-    if not np.allclose(matrix, matrix.T):
-        return None
+    batch = matrix.reshape(-1, n, n).astype(float)
+    count = batch.shape[0]
+
+    if tol is None:
+        tol = n * np.finfo(float).eps * np.linalg.norm(batch, axis=(1, 2))
+    tol = np.broadcast_to(np.asarray(tol, dtype=float), (count,))
+
+    symmetric = np.isclose(batch, batch.transpose(0, 2, 1)).all(axis=(1, 2))
+
+    # Fast path: if A - tol * I has a Cholesky factor, every eigenvalue
+    # is above tol and no eigen-decomposition is needed
+    try:
+        np.linalg.cholesky(batch - tol[:, None, None] * np.eye(n))
+        lowest = np.full(count, np.inf)
+        highest = np.full(count, np.inf)
+    except np.linalg.LinAlgError:
+        eigenvalues = np.linalg.eigvalsh(batch)
+        lowest = eigenvalues[:, 0]
+        highest = eigenvalues[:, -1]
+
+    positive = lowest > tol
+    negative = highest < -tol
+    positive_semi = lowest >= -tol
+    negative_semi = highest <= tol
+
+    result = np.select(
+        [~symmetric, positive, positive_semi, negative, negative_semi],
+        [None, "Positive definite", "Positive semi-definite",
+         "Negative definite", "Negative semi-definite"],
+        "Indefinite"
+    ).astype(object)
 
-    eigenvalues = np.linalg.eigvals(matrix)
-
-    positive = np.all(eigenvalues > 0)
-    negative = np.all(eigenvalues < 0)
-    positive_semi = np.all(eigenvalues >= 0) and np.any(eigenvalues == 0)
-    negative_semi = np.all(eigenvalues <= 0) and np.any(eigenvalues == 0)
-
-    if positive:
-        return "Positive definite"
-    elif positive_semi:
-        return "Positive semi-definite"
-    elif negative:
-        return "Negative definite"
-    elif negative_semi:
-        return "Negative semi-definite"
-    else:
-        return "Indefinite"
+    if len(matrix.shape) == 2:
+        return result[0]
+    return result.reshape(matrix.shape[:-2])
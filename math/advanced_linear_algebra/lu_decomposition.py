@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Module for LU decomposition of matrices given as lists of lists"""
+from fractions import Fraction
+
+
+def _check_square(matrix):
+    """Raise if matrix is not a non-empty square list of lists"""
+    if not isinstance(matrix, list):
+        raise TypeError("matrix must be a list of lists")
+
+    if len(matrix) == 0:
+        raise ValueError("matrix must be a non-empty square matrix")
+
+    if not all(isinstance(row, list) for row in matrix):
+        raise TypeError("matrix must be a list of lists")
+
+    n = len(matrix)
+
+    if not all(len(row) == n for row in matrix):
+        raise ValueError("matrix must be a non-empty square matrix")
+
+
+def _is_exact(matrix):
+    """Check whether every entry of a matrix is an int or a Fraction"""
+    return all(isinstance(x, (int, Fraction)) for row in matrix for x in row)
+
+
+def lu_decomposition(matrix, exact=None):
+    """
+    Calculate the LU decomposition of a matrix with partial pivoting
+
+    The factors are packed in a single matrix: the strict lower triangle
+    holds L (whose diagonal is all ones) and the upper triangle holds U,
+    so that the rows of matrix taken in the order perm equal L x U.
+    A singular matrix gives a zero on the diagonal of U.
+
+    Args:
+        matrix: list of lists representing a square matrix
+        exact: True to compute with fractions.Fraction, False to compute
+               with floats, None to use fractions only when every entry
+               is an int or a Fraction
+
+    Returns:
+        tuple of (lu, perm, sign) where sign is the parity (1 or -1) of
+        the row permutation perm
+    """
+    _check_square(matrix)
+
+    if exact is None:
+        exact = _is_exact(matrix)
+    convert = Fraction if exact else float
+
+    n = len(matrix)
+    lu = [[convert(x) for x in row] for row in matrix]
+    perm = list(range(n))
+    sign = 1
+
+    for k in range(n):
+        p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+        if lu[p][k] == 0:
+            continue
+        if p != k:
+            lu[k], lu[p] = lu[p], lu[k]
+            perm[k], perm[p] = perm[p], perm[k]
+            sign = -sign
+
+        pivot_row = lu[k]
+        pivot = pivot_row[k]
+        tail = pivot_row[k + 1:]
+        for i in range(k + 1, n):
+            row = lu[i]
+            factor = row[k] / pivot
+            row[k] = factor
+            if factor:
+                row[k + 1:] = [x - factor * y
+                               for x, y in zip(row[k + 1:], tail)]
+
+    return lu, perm, sign
+
+
+def determinant(matrix, exact=None):
+    """
+    Calculate the determinant of a matrix in O(n^3)
+
+    Args:
+        matrix: list of lists representing a square matrix
+        exact: see lu_decomposition
+
+    Returns:
+        the determinant, as an int for matrices of ints in exact mode
+    """
+    if matrix == [[]]:
+        return 1
+
+    lu, _, det = lu_decomposition(matrix, exact)
+    for i in range(len(lu)):
+        det *= lu[i][i]
+
+    if isinstance(det, Fraction) and det.denominator == 1:
+        if all(isinstance(x, int) for row in matrix for x in row):
+            return int(det)
+    return det
+
+
+def _substitute(lu, perm, b):
+    """Solve L x U x x = b[perm] for one right-hand side column"""
+    n = len(lu)
+    y = [b[p] for p in perm]
+    for i in range(n):
+        row = lu[i]
+        y[i] -= sum(row[j] * y[j] for j in range(i))
+    for i in range(n - 1, -1, -1):
+        row = lu[i]
+        y[i] = (y[i] - sum(row[j] * y[j] for j in range(i + 1, n))) / row[i]
+    return y
+
+
+def _inverse_columns(lu, perm, convert):
+    """Return the columns of the inverse of an already factored matrix"""
+    n = len(lu)
+    return [_substitute(lu, perm, [convert(int(i == j)) for i in range(n)])
+            for j in range(n)]
+
+
+def solve(matrix, b, exact=None):
+    """
+    Solve the linear system matrix x X = b
+
+    Args:
+        matrix: list of lists representing a square matrix
+        b: list of n numbers, or list of n lists holding several
+           right-hand side columns
+        exact: see lu_decomposition
+
+    Returns:
+        X with the same layout as b, or None if matrix is singular
+    """
+    if exact is None:
+        columns = b if isinstance(b[0], list) else [b]
+        exact = _is_exact(matrix) and _is_exact(columns)
+    lu, perm, _ = lu_decomposition(matrix, exact)
+    if any(lu[i][i] == 0 for i in range(len(lu))):
+        return None
+
+    convert = Fraction if exact else float
+    if not isinstance(b[0], list):
+        return _substitute(lu, perm, [convert(x) for x in b])
+
+    columns = [_substitute(lu, perm, [convert(row[j]) for row in b])
+               for j in range(len(b[0]))]
+    return [list(row) for row in zip(*columns)]
+
+
+def inverse(matrix, exact=None):
+    """
+    Calculate the inverse of a matrix in O(n^3)
+
+    Args:
+        matrix: list of lists representing a square matrix
+        exact: see lu_decomposition
+
+    Returns:
+        the inverse as a list of lists, or None if matrix is singular
+    """
+    _check_square(matrix)
+    n = len(matrix)
+
+    # Matrices of ints are inverted exactly as adj(A) / det(A)
+    if exact is not False and all(isinstance(x, int)
+                                  for row in matrix for x in row):
+        result = _bareiss_adjugate(matrix)
+        if result is None:
+            return None
+        det, adj = result
+        return [[Fraction(x, det) for x in row] for row in adj]
+
+    identity = [[int(i == j) for j in range(n)] for i in range(n)]
+    if exact is None:
+        exact = _is_exact(matrix)
+    return solve(matrix, identity, exact)
+
+
+def _bareiss_adjugate(matrix):
+    """
+    Calculate the adjugate of a matrix of ints without fractions
+
+    Runs fraction-free (Bareiss) Gauss-Jordan elimination on [A | I]:
+    every division is exact, the left block ends as d x I and the right
+    block as d x A^-1, where d is the determinant of the row-permuted A.
+
+    Args:
+        matrix: list of lists of ints representing a square matrix
+
+    Returns:
+        tuple of (det, adj) with the determinant and the adjugate as a
+        list of lists of ints, or None if the matrix is singular
+    """
+    n = len(matrix)
+    rows = [list(row) + [int(i == j) for j in range(n)]
+            for i, row in enumerate(matrix)]
+    sign = 1
+    prev = 1
+
+    for k in range(n):
+        p = next((i for i in range(k, n) if rows[i][k] != 0), None)
+        if p is None:
+            return None
+        if p != k:
+            rows[k], rows[p] = rows[p], rows[k]
+            sign = -sign
+
+        pivot_row = rows[k]
+        pivot = pivot_row[k]
+        for i in range(n):
+            if i == k:
+                continue
+            row = rows[i]
+            factor = row[k]
+            rows[i] = [(pivot * x - factor * y) // prev
+                       for x, y in zip(row, pivot_row)]
+        prev = pivot
+
+    return sign * prev, [[sign * x for x in row[n:]] for row in rows]
+
+
+def _null_vector(matrix):
+    """
+    Find a non-zero x with matrix x x = 0 for a matrix of nullity 1
+
+    Args:
+        matrix: list of lists of Fractions representing a square matrix
+
+    Returns:
+        x as a list of Fractions, or None if the nullity is not 1
+    """
+    n = len(matrix)
+    rows = [list(row) for row in matrix]
+    pivots = []
+    r = 0
+    for c in range(n):
+        p = next((i for i in range(r, n) if rows[i][c] != 0), None)
+        if p is None:
+            continue
+        rows[r], rows[p] = rows[p], rows[r]
+        pivot_row = [x / rows[r][c] for x in rows[r]]
+        rows[r] = pivot_row
+        for i in range(n):
+            if i != r and rows[i][c] != 0:
+                factor = rows[i][c]
+                rows[i] = [x - factor * y for x, y in zip(rows[i], pivot_row)]
+        pivots.append(c)
+        r += 1
+
+    if r != n - 1:
+        return None
+    free = next(c for c in range(n) if c not in pivots)
+    x = [Fraction(0)] * n
+    x[free] = Fraction(1)
+    for i, c in enumerate(pivots):
+        x[c] = -rows[i][free]
+    return x
+
+
+def _singular_adjugate(matrix):
+    """
+    Calculate the adjugate of a singular matrix
+
+    A x adj(A) = adj(A) x A = 0, so for a matrix of rank n - 1 the
+    adjugate is c x y^T, where x spans the null space of A and y the
+    null space of A^T; c follows from a single cofactor. For a lower
+    rank every cofactor is zero.
+
+    Args:
+        matrix: list of lists representing a singular square matrix
+
+    Returns:
+        the adjugate as a list of lists of Fractions
+    """
+    n = len(matrix)
+    exact = [[Fraction(x) for x in row] for row in matrix]
+    x = _null_vector(exact)
+    if x is None:
+        return [[Fraction(0)] * n for _ in range(n)]
+    y = _null_vector([list(col) for col in zip(*exact)])
+
+    i = next(k for k in range(n) if x[k] != 0)
+    j = next(k for k in range(n) if y[k] != 0)
+    sub = [[exact[r][c] for c in range(n) if c != i]
+           for r in range(n) if r != j]
+    c = (-1) ** (i + j) * determinant(sub, True) / (x[i] * y[j])
+    return [[c * xi * yj for yj in y] for xi in x]
+
+
+def adjugate(matrix, exact=None):
+    """
+    Calculate the adjugate matrix from a single factorization
+
+    Matrices of ints use fraction-free Bareiss elimination, other
+    non-singular matrices det(A) x A^-1 from one LU decomposition, and
+    singular matrices the rank n - 1 null space construction.
+
+    Args:
+        matrix: list of lists representing a square matrix
+        exact: see lu_decomposition
+
+    Returns:
+        the adjugate as a list of lists, with ints for matrices of ints
+    """
+    _check_square(matrix)
+    n = len(matrix)
+    if n == 1:
+        return [[1]]
+
+    ints = all(isinstance(x, int) for row in matrix for x in row)
+    if ints and exact is not False:
+        result = _bareiss_adjugate(matrix)
+        if result is not None:
+            return result[1]
+        return [[int(x) for x in row] for row in _singular_adjugate(matrix)]
+
+    if exact is None:
+        exact = _is_exact(matrix)
+    convert = Fraction if exact else float
+    lu, perm, det = lu_decomposition(matrix, exact)
+    for i in range(n):
+        det *= lu[i][i]
+
+    if det == 0:
+        adj = _singular_adjugate(matrix)
+        return [[convert(x) for x in row] for row in adj]
+
+    columns = _inverse_columns(lu, perm, convert)
+    return [[det * x for x in row] for row in zip(*columns)]
@@ -3,7 +3,96 @@
 import numpy as np
 
 
-def convolve_grayscale(images, kernel, padding='same', stride=(1, 1)):
+def _next_pow2(n):
+    """Returns the smallest power of 2 greater than or equal to n"""
+    return 1 << (int(n) - 1).bit_length()
+
+
+def _fft_plan(size, k):
+    """
+    Chooses the overlap-add tiling along one axis
+
+    Args:
+        size: length of the padded images along the axis
+        k: length of the kernel along the axis
+
+    Returns:
+        tuple of (block, nfft) where block is the tile length and nfft
+        the FFT length, with block + k - 1 <= nfft
+    """
+    nfft = _next_pow2(4 * k)
+    if nfft - k + 1 >= size:
+        return size, _next_pow2(size + k - 1)
+    return nfft - k + 1, nfft
+
+
+def _fft_correlate(padded_images, kernel):
+    """
+    Slides the kernel over the padded images using overlap-add FFTs
+
+    Args:
+        padded_images: numpy.ndarray with shape (m, hp, wp)
+        kernel: numpy.ndarray with shape (kh, kw)
+
+    Returns:
+        numpy.ndarray with shape (m, hp - kh + 1, wp - kw + 1) holding the
+        stride 1 convolution of every image
+    """
+    m, hp, wp = padded_images.shape
+    kh, kw = kernel.shape
+    bh, nh = _fft_plan(hp, kh)
+    bw, nw = _fft_plan(wp, kw)
+
+    # Convolving with the flipped kernel gives the sliding dot product
+    kernel_fft = np.fft.rfft2(kernel[::-1, ::-1], s=(nh, nw))
+
+    full = np.zeros((m, hp + kh - 1, wp + kw - 1))
+    for i in range(0, hp, bh):
+        for j in range(0, wp, bw):
+            tile = padded_images[:, i:i+bh, j:j+bw]
+            th, tw = tile.shape[1:]
+            tile_fft = np.fft.rfft2(tile, s=(nh, nw))
+            conv = np.fft.irfft2(tile_fft * kernel_fft, s=(nh, nw))
+            full[:, i:i+th+kh-1, j:j+tw+kw-1] += conv[:, :th+kh-1,
+                                                      :tw+kw-1]
+
+    return full[:, kh-1:hp, kw-1:wp]
+
+
+def _use_fft(m, padded_shape, kernel_shape, output_shape):
+    """
+    Decides whether the FFT path is cheaper than direct convolution
+
+    Args:
+        m: number of images
+        padded_shape: tuple of (hp, wp) of the padded images
+        kernel_shape: tuple of (kh, kw) of the kernel
+        output_shape: tuple of (output_h, output_w)
+
+    Returns:
+        True if the estimated FFT cost is lower than the direct cost
+    """
+    hp, wp = padded_shape
+    kh, kw = kernel_shape
+    bh, nh = _fft_plan(hp, kh)
+    bw, nw = _fft_plan(wp, kw)
+    tiles = -(-hp // bh) * -(-wp // bw)
+
+    # Costs are in multiply-adds of the direct path (about 0.4 ns each).
+    # Each output position costs its kh * kw multiply-adds plus about 60
+    # for reading its window
+    direct = m * output_shape[0] * output_shape[1] * (kh * kw + 60)
+    # Forward and inverse transform per tile, plus the spectrum product,
+    # and the fixed overhead of the numpy calls made for every tile
+    fft = (1.75 * m * tiles * nh * nw * (2 * np.log2(nh * nw) + 1) +
+           87500 * tiles)
+    # The direct path is exact for integer images and kernels, so the
+    # FFT is only used when it is at least twice as fast
+    return 2 * fft < direct
+
+
+def convolve_grayscale(images, kernel, padding='same', stride=(1, 1),
+                       method='auto'):
     """
     Performs a convolution on grayscale images
 
@@ -16,6 +105,13 @@ def convolve_grayscale(images, kernel, padding='same', stride=(1, 1)):
         stride: tuple of (sh, sw)
             sh is the stride for the height of the image
             sw is the stride for the width of the image
+        method: 'direct', 'fft' or 'auto'
+            'direct' slides the kernel over the images
+            'fft' uses overlap-add FFT convolution, which is faster for
+            large kernels
+            'auto' uses the FFT only when it is estimated to be at
+            least twice as fast, which in practice means kernels of
+            about 15x15 or more
 
     Returns:
         numpy.ndarray containing the convolved images
@@ -45,17 +141,28 @@ def convolve_grayscale(images, kernel, padding='same', stride=(1, 1)):
     output_h = (h + 2 * ph - kh) // sh + 1
     output_w = (w + 2 * pw - kw) // sw + 1
 
-    # Initialize output array
-    output = np.zeros((m, output_h, output_w))
+    if method == 'auto':
+        use_fft = _use_fft(m, padded_images.shape[1:], (kh, kw),
+                           (output_h, output_w))
+        method = 'fft' if use_fft else 'direct'
+
+    if method == 'fft':
+        output = _fft_correlate(padded_images, kernel)
+        output = output[:, ::sh, ::sw][:, :output_h, :output_w]
+        return np.ascontiguousarray(output)
+
+    # View every (kh, kw) window without copying: the window grid
+    # advances by the stride, the window itself by single pixels
+    s_m, s_h, s_w = padded_images.strides
+    windows = np.lib.stride_tricks.as_strided(
+        padded_images,
+        shape=(m, output_h, output_w, kh, kw),
+        strides=(s_m, s_h * sh, s_w * sw, s_h, s_w),
+        writeable=False
+    )
 
-    # Perform convolution using only 2 loops
-    for i in range(output_h):
-        for j in range(output_w):
-            # Calculate starting positions with stride
-            start_i = i * sh
-            start_j = j * sw
-            # Extract the region and perform element-wise multiplication
-            region = padded_images[:, start_i:start_i+kh, start_j:start_j+kw]
-            output[:, i, j] = np.sum(region * kernel, axis=(1, 2))
+    # einsum reads the windows in place, where tensordot would first
+    # copy all m x output_h x output_w x kh x kw of them
+    output = np.einsum('mijkl,kl->mij', windows, kernel)
 
-    return output
+    return output.astype(float, copy=False)
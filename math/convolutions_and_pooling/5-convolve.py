@@ -45,21 +45,17 @@ def convolve(images, kernels, padding='same', stride=(1, 1)):
     output_h = (h + 2 * ph - kh) // sh + 1
     output_w = (w + 2 * pw - kw) // sw + 1
 
-    # Initialize output array
-    output = np.zeros((m, output_h, output_w, nc))
+    # View every (kh, kw, c) window without copying: the window grid
+    # advances by the stride, the window itself by single pixels
+    s_m, s_h, s_w, s_c = padded_images.strides
+    windows = np.lib.stride_tricks.as_strided(
+        padded_images,
+        shape=(m, output_h, output_w, kh, kw, c),
+        strides=(s_m, s_h * sh, s_w * sw, s_h, s_w, s_c),
+        writeable=False
+    )
 
-    # Perform convolution using 3 loops
-    for i in range(output_h):
-        for j in range(output_w):
-            for k in range(nc):
-                # Calculate starting positions with stride
-                start_i = i * sh
-                start_j = j * sw
-                # Extract the region and perform element-wise multiplication
-                # Sum across height, width, and channels for each kernel
-                region = padded_images[:, start_i:start_i+kh,
-                                       start_j:start_j+kw, :]
-                output[:, i, j, k] = np.sum(region * kernels[:, :, :, k],
-                                            axis=(1, 2, 3))
+    # Convolve with all kernels at once as a single matrix product
+    output = np.tensordot(windows, kernels, axes=([3, 4, 5], [0, 1, 2]))
 
-    return output
+    return output.astype(float, copy=False)
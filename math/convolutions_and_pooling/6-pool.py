@@ -3,7 +3,7 @@
 import numpy as np
 
 
-def pool(images, kernel_shape, stride, mode='max'):
+def pool(images, kernel_shape, stride, mode='max', return_indices=False):
     """
     Performs pooling on images
 
@@ -18,9 +18,13 @@ def pool(images, kernel_shape, stride, mode='max'):
         mode: indicates the type of pooling
             'max' indicates max pooling
             'avg' indicates average pooling
+        return_indices: if True, also return where each maximum was found
 
     Returns:
-        numpy.ndarray containing the pooled images
+        numpy.ndarray containing the pooled images, and if return_indices
+        is True, a numpy.ndarray with the same shape holding the flat
+        index (row * w + col) into each (h, w) channel plane of the
+        element that won the max (None for average pooling)
     """
     m, h, w, c = images.shape
     kh, kw = kernel_shape
@@ -30,22 +34,46 @@ def pool(images, kernel_shape, stride, mode='max'):
     output_h = (h - kh) // sh + 1
     output_w = (w - kw) // sw + 1
 
-    # Initialize output array
-    output = np.zeros((m, output_h, output_w, c))
-
-    # Perform pooling using only 2 loops
-    for i in range(output_h):
-        for j in range(output_w):
-            # Calculate starting positions with stride
-            start_i = i * sh
-            start_j = j * sw
-            # Extract the region
-            region = images[:, start_i:start_i+kh, start_j:start_j+kw, :]
-
-            # Apply pooling operation
-            if mode == 'max':
-                output[:, i, j, :] = np.max(region, axis=(1, 2))
-            elif mode == 'avg':
-                output[:, i, j, :] = np.mean(region, axis=(1, 2))
+    indices = None
+    if mode == 'max':
+        # View every (kh, kw) window without copying
+        s_m, s_h, s_w, s_c = images.strides
+        windows = np.lib.stride_tricks.as_strided(
+            images,
+            shape=(m, output_h, output_w, c, kh, kw),
+            strides=(s_m, s_h * sh, s_w * sw, s_c, s_h, s_w),
+            writeable=False
+        )
+        if return_indices:
+            # Flattening the windows copies them, so only do it when the
+            # position of the max is needed
+            flat = windows.reshape(m, output_h, output_w, c, kh * kw)
+            best = np.argmax(flat, axis=4)
+            output = np.take_along_axis(flat, best[..., None], axis=4)
+            output = output[..., 0].astype(float)
+            rows = np.arange(output_h)[:, None, None] * sh + best // kw
+            cols = np.arange(output_w)[None, :, None] * sw + best % kw
+            indices = rows * w + cols
+        else:
+            output = np.max(windows, axis=(4, 5)).astype(float)
+    elif mode == 'avg':
+        # Summed-area table: any window sum takes four lookups, whatever
+        # the kernel size
+        table = np.zeros((m, h + 1, w + 1, c), dtype=np.result_type(
+            images.dtype, float))
+        np.cumsum(images, axis=1, out=table[:, 1:, 1:, :])
+        np.cumsum(table[:, 1:, 1:, :], axis=2, out=table[:, 1:, 1:, :])
+        rows = slice(0, (output_h - 1) * sh + 1, sh)
+        cols = slice(0, (output_w - 1) * sw + 1, sw)
+        rows_end = slice(kh, kh + (output_h - 1) * sh + 1, sh)
+        cols_end = slice(kw, kw + (output_w - 1) * sw + 1, sw)
+        output = (table[:, rows_end, cols_end, :]
+                  - table[:, rows, cols_end, :]
+                  - table[:, rows_end, cols, :]
+                  + table[:, rows, cols, :]) / (kh * kw)
+    else:
+        output = np.zeros((m, output_h, output_w, c))
 
+    if return_indices:
+        return output, indices
     return output
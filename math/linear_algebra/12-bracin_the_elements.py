@@ -1,7 +1,203 @@
 #!/usr/bin/env python3
 """Module for element-wise operations on numpy arrays"""
+import operator
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+CHUNK = 1 << 16
+
+_UFUNCS = {
+    np.add: operator.add,
+    np.subtract: operator.sub,
+    np.multiply: operator.mul,
+    np.true_divide: operator.truediv,
+}
+
+
+class Expression(NDArrayOperatorsMixin):
+    """
+    Deferred element-wise arithmetic on numpy arrays
+
+    Combining expressions with +, -, * and / only records the operation.
+    The whole expression is computed on first use in a single pass over
+    chunks of CHUNK elements, so intermediate results never take more
+    than a chunk of memory and the only full-size buffer is the output.
+
+    Every other operator, numpy function or ndarray attribute computes
+    the expression and acts on the result, so an Expression can be used
+    wherever a numpy.ndarray is expected. Once computed, an expression
+    keeps its result, and expressions built on it read that result.
+    """
+
+    def __init__(self, op, left, right):
+        """
+        Initialize an expression
+
+        Args:
+            op: binary function from the operator module
+            left: Expression, numpy.ndarray or scalar
+            right: Expression, numpy.ndarray or scalar
+        """
+        self.__op = op
+        self.__left = self.__operand(left)
+        self.__right = self.__operand(right)
+        self.__value = None
+
+    @staticmethod
+    def __operand(x):
+        """Keep expressions and scalars, convert anything else to an array"""
+        if isinstance(x, Expression) or np.isscalar(x):
+            return x
+        return np.asarray(x)
+
+    def __leaves(self, leaves):
+        """Collect the distinct arrays of the expression tree, in order"""
+        for x in (self.__left, self.__right):
+            if isinstance(x, Expression) and x.__value is not None:
+                x = x.__value
+            if isinstance(x, Expression):
+                x.__leaves(leaves)
+            elif isinstance(x, np.ndarray):
+                leaves.setdefault(id(x), x)
+        return leaves
+
+    def __compute(self, chunks):
+        """Evaluate the expression tree on one chunk of every leaf"""
+        args = []
+        for x in (self.__left, self.__right):
+            if isinstance(x, Expression) and x.__value is not None:
+                x = x.__value
+            if isinstance(x, Expression):
+                x = x.__compute(chunks)
+            elif isinstance(x, np.ndarray):
+                x = chunks[id(x)]
+            args.append(x)
+        return self.__op(*args)
+
+    @property
+    def dtype(self):
+        """Return the dtype of the result without computing it"""
+        leaves = self.__leaves({})
+        return np.asarray(self.__compute(
+            {k: np.empty(0, dtype=v.dtype) for k, v in leaves.items()})).dtype
+
+    @property
+    def shape(self):
+        """Return the shape of the result without computing it"""
+        leaves = self.__leaves({})
+        return np.broadcast_shapes(*(v.shape for v in leaves.values()))
+
+    def evaluate(self):
+        """
+        Compute the expression, or return the result of a previous call
+
+        Returns:
+            numpy.ndarray holding the result
+        """
+        if self.__value is not None:
+            return self.__value
+
+        leaves = self.__leaves({})
+        if not leaves:
+            self.__value = np.asarray(self.__compute({}))
+            return self.__value
+
+        keys = list(leaves)
+        operands = [leaves[k] for k in keys] + [None]
+        flags = [['readonly']] * len(keys) + [['writeonly', 'allocate']]
+        dtypes = [None] * len(keys) + [self.dtype]
+        with np.nditer(operands, flags=['external_loop', 'buffered',
+                                        'zerosize_ok', 'refs_ok'],
+                       op_flags=flags, op_dtypes=dtypes,
+                       buffersize=CHUNK) as it:
+            for views in it:
+                views[-1][...] = self.__compute(dict(zip(keys, views)))
+            self.__value = it.operands[-1]
+        return self.__value
+
+    def __array__(self, dtype=None, copy=None):
+        """Return the result for numpy functions"""
+        value = self.evaluate()
+        if dtype is not None:
+            return value.astype(dtype, copy=False)
+        return value
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Defer the four arithmetic ufuncs and compute any other"""
+        if method == '__call__' and ufunc in _UFUNCS and not kwargs:
+            return Expression(_UFUNCS[ufunc], *inputs)
+        out = kwargs.get('out', ())
+        if out:
+            kwargs['out'] = tuple(x.evaluate() if isinstance(x, Expression)
+                                  else x for x in out)
+        inputs = [x.evaluate() if isinstance(x, Expression) else x
+                  for x in inputs]
+        result = getattr(ufunc, method)(*inputs, **kwargs)
+        if any(isinstance(x, Expression) for x in out):
+            return out[0] if len(out) == 1 else out
+        return result
+
+    def __getattr__(self, name):
+        """Forward other ndarray attributes (sum, T, reshape, ...)"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.evaluate(), name)
+
+    def __getitem__(self, index):
+        """Index the computed result"""
+        return self.evaluate()[index]
+
+    def __setitem__(self, index, value):
+        """Assign into the computed result"""
+        self.evaluate()[index] = value
+
+    def __len__(self):
+        """Return the length of the result"""
+        return len(self.evaluate())
+
+    def __float__(self):
+        """Return the only element of the result as a float"""
+        return float(self.evaluate())
+
+    def __int__(self):
+        """Return the only element of the result as an int"""
+        return int(self.evaluate())
+
+    def __bool__(self):
+        """Return the truth value of the result"""
+        return bool(self.evaluate())
+
+    def __str__(self):
+        """Return the computed result as a string"""
+        return str(self.evaluate())
+
+    def __repr__(self):
+        """Return a printable representation of the computed result"""
+        return repr(self.evaluate())
 
 
 def np_elementwise(mat1, mat2):
-    """Perform element-wise operations on two matrices"""
-    return (mat1 + mat2, mat1 - mat2, mat1 * mat2, mat1 / mat2)
+    """
+    Perform element-wise operations on two matrices
+
+    Nothing is computed up front: each result is an Expression that is
+    computed the first time it is used, so unused results cost no memory
+    and results combined further are computed in one fused pass. Every
+    numpy.ndarray operator, attribute and method works on a result.
+
+    Because the inputs are read only when a result is first used,
+    changes made to mat1 or mat2 before then are seen in the result;
+    copy the inputs, or call evaluate() on the results, before changing
+    them. Once computed, a result no longer depends on the inputs.
+
+    Args:
+        mat1: numpy.ndarray
+        mat2: numpy.ndarray or scalar broadcastable with mat1
+
+    Returns:
+        tuple of the element-wise sum, difference, product and quotient
+    """
+    return (Expression(operator.add, mat1, mat2),
+            Expression(operator.sub, mat1, mat2),
+            Expression(operator.mul, mat1, mat2),
+            Expression(operator.truediv, mat1, mat2))
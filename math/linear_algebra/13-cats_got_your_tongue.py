@@ -1,8 +1,379 @@
 #!/usr/bin/env python3
 """Module for concatenating numpy arrays"""
+from bisect import bisect_right
 import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+MAX_SEGMENTS = 32
+
+
+def _readonly(array):
+    """Return a view of array that cannot be written through"""
+    view = array.view()
+    view.setflags(write=False)
+    return view
+
+
+class ConcatArray(NDArrayOperatorsMixin):
+    """
+    Concatenation of numpy arrays along an axis that defers the copy
+
+    The arrays are kept as separate segments until the joined array is
+    needed. Segments are then copied once into a buffer that grows by
+    doubling along the axis. Appending to the latest concatenation
+    reuses the spare room in that buffer, so building an array by
+    repeated appends costs amortized O(1) per element instead of copying
+    everything on every step.
+
+    Otherwise it behaves like the joined numpy.ndarray: operators and
+    numpy functions act on the joined array and other ndarray attributes
+    are forwarded to it. Since the buffer and the input arrays are
+    shared, the arrays handed out by materialize, indexing and
+    numpy.asarray are read-only views. Assigning into a ConcatArray
+    (c[i] = x, c += 1) first moves it to a buffer of its own if its
+    current one is shared, so no other array ever changes.
+    """
+
+    def __init__(self, arrays, axis=0):
+        """
+        Initialize the concatenation
+
+        Args:
+            arrays: sequence of numpy.ndarrays (or ConcatArrays) whose
+                    shapes match except along axis
+            axis: axis along which the arrays are joined
+
+        Raises:
+            ValueError: if there are no arrays, axis is out of range or
+                        the shapes do not line up
+        """
+        arrays = [a.materialize() if isinstance(a, ConcatArray)
+                  else np.asarray(a) for a in arrays]
+        if len(arrays) == 0:
+            raise ValueError("need at least one array to concatenate")
+        ndim = arrays[0].ndim
+        if ndim == 0:
+            raise ValueError("zero-dimensional arrays cannot be concatenated")
+        if not -ndim <= axis < ndim:
+            raise ValueError("axis {} is out of bounds for array of "
+                             "dimension {}".format(axis, ndim))
+        axis %= ndim
+
+        self.__axis = axis
+        self.__store = None
+        self.__stored = 0
+        self.__segments = []
+        self.__length = 0
+        self.__shape = arrays[0].shape
+        self.__dtype = np.result_type(*arrays)
+        for a in arrays:
+            self.__add(a)
+
+    def __add(self, array):
+        """Record one more segment after checking its shape"""
+        shape = self.__shape
+        if (array.ndim != len(shape) or
+                array.shape[:self.__axis] != shape[:self.__axis] or
+                array.shape[self.__axis + 1:] != shape[self.__axis + 1:]):
+            raise ValueError("all the input array dimensions except for "
+                             "the concatenation axis must match exactly")
+        self.__segments.append(array)
+        self.__length += array.shape[self.__axis]
+        self.__dtype = np.result_type(self.__dtype, array)
+
+    @property
+    def axis(self):
+        """Return the axis along which the arrays are joined"""
+        return self.__axis
+
+    @property
+    def shape(self):
+        """Return the shape of the joined array"""
+        shape = list(self.__shape)
+        shape[self.__axis] = self.__length
+        return tuple(shape)
+
+    @property
+    def dtype(self):
+        """Return the dtype of the joined array"""
+        return self.__dtype
+
+    @property
+    def ndim(self):
+        """Return the number of dimensions of the joined array"""
+        return len(self.__shape)
+
+    def __along(self, start, stop):
+        """Return an index selecting start:stop along the axis"""
+        return (slice(None),) * self.__axis + (slice(start, stop),)
+
+    def append(self, array):
+        """
+        Return the concatenation of this array and one more array
+
+        Neither this object nor array is copied. Once more than
+        MAX_SEGMENTS segments are pending they are materialized.
+
+        Args:
+            array: numpy.ndarray or ConcatArray to add at the end
+
+        Returns:
+            a new ConcatArray
+        """
+        if isinstance(array, ConcatArray):
+            array = array.materialize()
+        new = ConcatArray.__new__(ConcatArray)
+        new.__axis = self.__axis
+        new.__store = self.__store
+        new.__stored = self.__stored
+        new.__segments = list(self.__segments)
+        new.__length = self.__length
+        new.__shape = self.__shape
+        new.__dtype = self.__dtype
+        new.__add(np.asarray(array))
+        self.__share()
+        if len(new.__segments) > MAX_SEGMENTS:
+            new.__join()
+        return new
+
+    def __share(self):
+        """Mark the buffer as seen by another array or concatenation"""
+        if self.__store is not None:
+            self.__store[2] = True
+
+    def materialize(self):
+        """
+        Return the joined array, copying pending segments into the buffer
+
+        Returns:
+            numpy.ndarray holding the joined array, a read-only view of
+            the buffer
+        """
+        value = self.__join()
+        self.__share()
+        return value
+
+    def __writable(self):
+        """
+        Return the joined array as a view that can be written
+
+        The buffer is copied first if anything else can see it, so the
+        write does not show up in any other array.
+        """
+        self.__join()
+        store = self.__store
+        if store is None or store[2] or store[1] != self.__stored:
+            buffer = np.array(self.__join())
+            store = [buffer, self.__length, False]
+            self.__store = store
+            self.__stored = self.__length
+        return store[0][self.__along(0, self.__stored)]
+
+    def __join(self):
+        """
+        Copy the pending segments into the buffer
+
+        The buffer is shared with the concatenations this one was
+        appended from. Its spare room is written in place only if no
+        other concatenation has written past this one, so the earlier
+        concatenations, which see only their own prefix, never change.
+        Otherwise a new buffer of double the old capacity, or of the
+        needed size if larger, is allocated.
+
+        Returns:
+            numpy.ndarray holding the joined array, a read-only view of
+            the buffer
+        """
+        store, stored, axis = self.__store, self.__stored, self.__axis
+        if not self.__segments:
+            if store is None:
+                return np.empty(self.shape, dtype=self.__dtype)
+            return _readonly(store[0][self.__along(0, stored)])
+
+        length = self.__length
+        if (store is None or store[1] != stored or
+                store[0].shape[axis] < length or
+                store[0].dtype != self.__dtype):
+            capacity = length
+            if store is not None:
+                capacity = max(length, 2 * store[0].shape[axis])
+            shape = list(self.__shape)
+            shape[axis] = capacity
+            buffer = np.empty(shape, dtype=self.__dtype)
+            if store is not None:
+                buffer[self.__along(0, stored)] = \
+                    store[0][self.__along(0, stored)]
+            store = [buffer, stored, False]
+
+        buffer, start = store[0], stored
+        for segment in self.__segments:
+            stop = start + segment.shape[axis]
+            buffer[self.__along(start, stop)] = segment
+            start = stop
+        store[1] = length
+
+        self.__store = store
+        self.__stored = length
+        self.__segments = []
+        return _readonly(buffer[self.__along(0, length)])
+
+    def __parts(self):
+        """Return the segments with their starting offsets along the axis"""
+        parts = [_readonly(segment) for segment in self.__segments]
+        if self.__stored:
+            parts.insert(0, _readonly(
+                self.__store[0][self.__along(0, self.__stored)]))
+        offsets = [0]
+        for part in parts:
+            offsets.append(offsets[-1] + part.shape[self.__axis])
+        return parts, offsets
+
+    def __getitem__(self, key):
+        """
+        Index the joined array
+
+        An integer or a slice along the axis touches only the segments
+        it covers; a range inside one segment returns a read-only view
+        of it.
+        Other kinds of index materialize the array first.
+        """
+        value = self.__index(key)
+        if isinstance(value, np.ndarray):
+            self.__share()
+        return value
+
+    def __setitem__(self, key, value):
+        """Assign into the joined array"""
+        self.__writable()[key] = value
+
+    def __index(self, key):
+        """Index the joined array, see __getitem__"""
+        axis = self.__axis
+        index = key if isinstance(key, tuple) else (key,)
+        simple = all(isinstance(k, (int, np.integer, slice)) and
+                     not isinstance(k, bool) for k in index)
+        if not simple or len(index) > self.ndim:
+            return self.materialize()[key]
+        if len(index) <= axis:
+            index = index + (slice(None),) * (axis + 1 - len(index))
+
+        parts, offsets = self.__parts()
+        k = index[axis]
+        before, after = index[:axis], index[axis + 1:]
+
+        if not isinstance(k, slice):
+            k = int(k)
+            if k < 0:
+                k += self.__length
+            if not 0 <= k < self.__length:
+                raise IndexError("index {} is out of bounds for axis {} "
+                                 "with size {}".format(index[axis], axis,
+                                                       self.__length))
+            i = bisect_right(offsets, k) - 1
+            return parts[i][before + (k - offsets[i],) + after]
+
+        start, stop, step = k.indices(self.__length)
+        pieces = []
+        for i, part in enumerate(parts):
+            lo, hi = offsets[i], offsets[i + 1]
+            if step > 0:
+                first = start if start >= lo else \
+                    start + -(-(lo - start) // step) * step
+                if first >= min(hi, stop):
+                    continue
+                local = slice(first - lo, min(hi, stop) - lo, step)
+            else:
+                first = start if start < hi else \
+                    start - -(-(start - hi + 1) // -step) * -step
+                if first < max(lo, stop + 1):
+                    continue
+                end = stop - lo if stop >= lo else None
+                local = slice(first - lo, end, step)
+            pieces.append(part[before + (local,) + after])
+
+        if step < 0:
+            pieces.reverse()
+        result_axis = axis - sum(not isinstance(b, slice) for b in before)
+        if len(pieces) == 1:
+            return pieces[0]
+        if not pieces:
+            return self.materialize()[key]
+        return np.concatenate(pieces, axis=result_axis)
+
+    def __len__(self):
+        """Return the length of the first axis"""
+        return self.shape[0]
+
+    def __getattr__(self, name):
+        """Forward other ndarray attributes (sum, T, reshape, ...)"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Apply a ufunc to the joined arrays, writing into c for out=c"""
+        out = kwargs.get('out', ())
+        writable = {id(x): x.__writable() for x in out
+                    if isinstance(x, ConcatArray)}
+        if out:
+            kwargs['out'] = tuple(writable.get(id(x), x) for x in out)
+        inputs = [writable[id(x)] if id(x) in writable else
+                  x.materialize() if isinstance(x, ConcatArray) else x
+                  for x in inputs]
+        result = getattr(ufunc, method)(*inputs, **kwargs)
+        if writable:
+            return out[0] if len(out) == 1 else out
+        return result
+
+    def __array__(self, dtype=None, copy=None):
+        """Return the joined array for numpy functions"""
+        value = self.materialize()
+        if dtype is not None:
+            value = value.astype(dtype, copy=False)
+        if copy and np.shares_memory(value, self.materialize()):
+            value = value.copy()
+        return value
+
+    def __float__(self):
+        """Return the only element of the joined array as a float"""
+        return float(self.__join())
+
+    def __int__(self):
+        """Return the only element of the joined array as an int"""
+        return int(self.__join())
+
+    def __bool__(self):
+        """Return the truth value of the joined array"""
+        return bool(self.__join())
+
+    def __str__(self):
+        """Return the joined array as a string"""
+        return str(self.__join())
+
+    def __repr__(self):
+        """Return a printable representation of the joined array"""
+        return repr(self.__join())
 
 
 def np_cat(mat1, mat2, axis=0):
-    """Concatenate two matrices along a specific axis"""
-    return np.concatenate((mat1, mat2), axis=axis)
+    """
+    Concatenate two matrices along a specific axis
+
+    No data is copied until the result is used. Concatenating onto a
+    previous result along the same axis appends to it, so joining arrays
+    in a loop takes linear rather than quadratic time. The result can be
+    used like a numpy.ndarray (see ConcatArray); since the inputs are
+    read when it is first used, changes made to mat1 or mat2 before then
+    are seen in it.
+
+    Args:
+        mat1: numpy.ndarray or ConcatArray
+        mat2: numpy.ndarray or ConcatArray
+        axis: axis along which to concatenate
+
+    Returns:
+        ConcatArray holding the concatenation
+    """
+    if isinstance(mat1, ConcatArray) and mat1.axis == axis % mat1.ndim:
+        return mat1.append(mat2)
+    return ConcatArray((mat1, mat2), axis)
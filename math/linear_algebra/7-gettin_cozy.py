@@ -3,13 +3,30 @@
 
 
 def cat_matrices2D(mat1, mat2, axis=0):
-    """Concatenate two matrices along a specific axis"""
+    """
+    Concatenate two matrices along a specific axis
+
+    The result shares no rows with the inputs. Every row is copied by a
+    single C-level call (list.copy, or list.__add__ joining two rows
+    straight into a new list) instead of per-row slices.
+
+    Args:
+        mat1: list of lists of numbers
+        mat2: list of lists of numbers
+        axis: 0 to join the rows, 1 to join the columns
+
+    Returns:
+        a new list of lists, or None if the shapes do not line up or axis
+        is not 0 or 1
+    """
     if axis == 0:
         if len(mat1[0]) != len(mat2[0]):
             return None
-        return [row[:] for row in mat1] + [row[:] for row in mat2]
+        result = list(map(list.copy, mat1))
+        result.extend(map(list.copy, mat2))
+        return result
     elif axis == 1:
         if len(mat1) != len(mat2):
             return None
-        return [mat1[i][:] + mat2[i][:] for i in range(len(mat1))]
+        return list(map(list.__add__, mat1, mat2))
     return None
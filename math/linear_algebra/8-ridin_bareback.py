@@ -1,11 +1,95 @@
 #!/usr/bin/env python3
 """Module for matrix multiplication"""
+from operator import add, mul, sub
+
+TILE = 32
+STRASSEN_MIN = 256
+
+
+def _tiled_mul(mat1, mat2):
+    """
+    Multiply two matrices through the transpose of mat2
+
+    Every entry is the dot product of a row of mat1 and a row of the
+    transpose, computed by sum(map(mul, ...)). The columns are visited
+    in tiles of TILE so that the rows in use stay in cache while every
+    row of mat1 passes over them.
+    """
+    columns = list(zip(*mat2))
+    out = [[] for _ in mat1]
+    for j in range(0, len(columns), TILE):
+        tile = columns[j:j + TILE]
+        for row, out_row in zip(mat1, out):
+            out_row.extend([sum(map(mul, row, col)) for col in tile])
+    return out
+
+
+def _add(mat1, mat2):
+    """Add two matrices element-wise"""
+    return [list(map(add, r1, r2)) for r1, r2 in zip(mat1, mat2)]
+
+
+def _sub(mat1, mat2):
+    """Subtract two matrices element-wise"""
+    return [list(map(sub, r1, r2)) for r1, r2 in zip(mat1, mat2)]
+
+
+def _strassen(mat1, mat2):
+    """
+    Multiply two n x n matrices with Strassen's algorithm
+
+    Each level replaces 8 half-size products by 7. Recursion stops at
+    half of STRASSEN_MIN or at an odd size, where _tiled_mul takes over.
+    """
+    n = len(mat1)
+    if n < STRASSEN_MIN or n % 2:
+        return _tiled_mul(mat1, mat2)
+
+    h = n // 2
+    a11 = [r[:h] for r in mat1[:h]]
+    a12 = [r[h:] for r in mat1[:h]]
+    a21 = [r[:h] for r in mat1[h:]]
+    a22 = [r[h:] for r in mat1[h:]]
+    b11 = [r[:h] for r in mat2[:h]]
+    b12 = [r[h:] for r in mat2[:h]]
+    b21 = [r[:h] for r in mat2[h:]]
+    b22 = [r[h:] for r in mat2[h:]]
+
+    m1 = _strassen(_add(a11, a22), _add(b11, b22))
+    m2 = _strassen(_add(a21, a22), b11)
+    m3 = _strassen(a11, _sub(b12, b22))
+    m4 = _strassen(a22, _sub(b21, b11))
+    m5 = _strassen(_add(a11, a12), b22)
+    m6 = _strassen(_sub(a21, a11), _add(b11, b12))
+    m7 = _strassen(_sub(a12, a22), _add(b21, b22))
+
+    c11 = _add(_sub(_add(m1, m4), m5), m7)
+    c12 = _add(m3, m5)
+    c21 = _add(m2, m4)
+    c22 = _add(_sub(m1, m2), _add(m3, m6))
+    return ([r1 + r2 for r1, r2 in zip(c11, c12)] +
+            [r1 + r2 for r1, r2 in zip(c21, c22)])
 
 
 def mat_mul(mat1, mat2):
-    """Perform matrix multiplication"""
-    if len(mat1[0]) != len(mat2):
+    """
+    Perform matrix multiplication
+
+    Square matrices of size STRASSEN_MIN or more use Strassen's
+    algorithm; all other shapes use a tiled multiply over the transpose
+    of mat2.
+
+    Args:
+        mat1: list of lists of numbers with shape (m, n)
+        mat2: list of lists of numbers with shape (n, p)
+
+    Returns:
+        the product as a new list of lists with shape (m, p), or None if
+        the shapes do not line up
+    """
+    n = len(mat2)
+    if len(mat1[0]) != n:
         return None
-    return [[sum(mat1[i][k] * mat2[k][j] for k in range(len(mat2)))
-             for j in range(len(mat2[0]))]
-            for i in range(len(mat1))]
+    if len(mat1) == n == len(mat2[0]):
+        return _strassen(mat1, mat2)
+    return _tiled_mul(mat1, mat2)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Module for a dense matrix stored in a flat array of doubles"""
+from array import array
+from operator import add, mul
+
+
+class Matrix:
+    """
+    Dense 2D matrix of floats stored row-major in a single array('d')
+
+    Element (i, j) lives at index i * cols + j, so a row is one contiguous
+    slice of the buffer. The buffer can be shared with NumPy without a
+    copy through to_numpy, from_numpy and numpy.asarray.
+    """
+
+    __slots__ = ('__rows', '__cols', '__data')
+
+    def __init__(self, rows, cols, data=None):
+        """
+        Initialize a matrix
+
+        Args:
+            rows: number of rows
+            cols: number of columns
+            data: iterable of rows * cols numbers in row-major order, or a
+                  writable buffer of doubles used without copying; None
+                  gives a matrix of zeros
+
+        Raises:
+            TypeError: if rows or cols is not an integer
+            ValueError: if rows or cols is negative or data does not hold
+                        rows * cols numbers
+        """
+        if not isinstance(rows, int) or not isinstance(cols, int):
+            raise TypeError("rows and cols must be integers")
+        if rows < 0 or cols < 0:
+            raise ValueError("rows and cols must be non-negative")
+
+        if data is None:
+            data = array('d', bytes(8 * rows * cols))
+        elif not isinstance(data, (array, memoryview)):
+            data = array('d', data)
+        if len(data) != rows * cols:
+            raise ValueError("data must hold rows * cols numbers")
+
+        self.__rows = rows
+        self.__cols = cols
+        self.__data = data
+
+    @classmethod
+    def from_list(cls, matrix):
+        """
+        Create a matrix from a list of lists
+
+        Args:
+            matrix: list of lists, all rows having the same length
+
+        Returns:
+            a new Matrix holding a copy of the values
+
+        Raises:
+            ValueError: if the rows do not all have the same length
+        """
+        rows = len(matrix)
+        cols = len(matrix[0]) if rows else 0
+        data = array('d')
+        for row in matrix:
+            if len(row) != cols:
+                raise ValueError("matrix rows must have the same length")
+            data.extend(row)
+        return cls(rows, cols, data)
+
+    @classmethod
+    def from_numpy(cls, ndarray):
+        """
+        Create a matrix from a 2D numpy.ndarray
+
+        A C-contiguous float64 array is shared without a copy, so writes
+        through either object are seen by the other. Any other array is
+        copied once.
+
+        Args:
+            ndarray: numpy.ndarray with shape (rows, cols)
+
+        Returns:
+            a new Matrix
+
+        Raises:
+            ValueError: if ndarray is not 2D
+        """
+        if ndarray.ndim != 2:
+            raise ValueError("ndarray must be 2D")
+        rows, cols = ndarray.shape
+        view = memoryview(ndarray)
+        if view.c_contiguous and view.format == 'd' and not view.readonly:
+            return cls(rows, cols, view.cast('B').cast('d'))
+        return cls(rows, cols, ndarray.astype(float).ravel().tolist())
+
+    @property
+    def shape(self):
+        """Return the shape of the matrix as [rows, cols]"""
+        return [self.__rows, self.__cols]
+
+    @property
+    def data(self):
+        """Return the flat row-major buffer"""
+        return self.__data
+
+    def to_numpy(self):
+        """
+        Return a numpy.ndarray view of the matrix without copying
+
+        Returns:
+            numpy.ndarray with shape (rows, cols) sharing this buffer
+        """
+        import numpy as np
+        return np.frombuffer(self.__data, dtype=float).reshape(
+            self.__rows, self.__cols)
+
+    def __array__(self, dtype=None, copy=None):
+        """Return the matrix for numpy functions, without a copy"""
+        value = self.to_numpy()
+        if dtype is not None:
+            return value.astype(dtype, copy=bool(copy))
+        if copy:
+            return value.copy()
+        return value
+
+    def __buffer__(self, flags):
+        """Expose the matrix as a (rows, cols) buffer of doubles"""
+        return memoryview(self.__data).cast('B').cast(
+            'd', [self.__rows, self.__cols])
+
+    def tolist(self):
+        """Return the matrix as a list of lists"""
+        data, cols = self.__data, self.__cols
+        return [data[i * cols:(i + 1) * cols].tolist()
+                for i in range(self.__rows)]
+
+    def row(self, i):
+        """Return row i as an array('d')"""
+        cols = self.__cols
+        return array('d', self.__data[i * cols:(i + 1) * cols])
+
+    def __getitem__(self, index):
+        """Return the element at index (i, j)"""
+        i, j = index
+        return self.__data[i * self.__cols + j]
+
+    def __setitem__(self, index, value):
+        """Set the element at index (i, j)"""
+        i, j = index
+        self.__data[i * self.__cols + j] = value
+
+    def __len__(self):
+        """Return the number of rows"""
+        return self.__rows
+
+    def __eq__(self, other):
+        """Check whether two matrices have the same shape and values"""
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return (self.shape == other.shape and
+                all(map(float.__eq__, self.__data, other.data)))
+
+    def __repr__(self):
+        """Return a printable representation of the matrix"""
+        return "Matrix({})".format(self.tolist())
+
+    def transpose(self):
+        """
+        Return the transpose of the matrix
+
+        Column j is the strided slice data[j::cols], copied into row j
+        of the result in one step.
+
+        Returns:
+            a new Matrix with shape [cols, rows]
+        """
+        rows, cols = self.__rows, self.__cols
+        data = self.__data
+        if isinstance(data, memoryview):
+            data = array('d', data)
+        out = array('d')
+        for j in range(cols):
+            out.extend(data[j::cols])
+        return Matrix(cols, rows, out)
+
+    @property
+    def T(self):
+        """Return the transpose of the matrix"""
+        return self.transpose()
+
+    def add(self, other):
+        """
+        Add two matrices element-wise
+
+        Args:
+            other: Matrix with the same shape
+
+        Returns:
+            a new Matrix, or None if the shapes differ
+        """
+        if self.shape != other.shape:
+            return None
+        return Matrix(self.__rows, self.__cols,
+                      array('d', list(map(add, self.__data, other.data))))
+
+    def __add__(self, other):
+        """Add two matrices element-wise"""
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        result = self.add(other)
+        if result is None:
+            raise ValueError("matrices must have the same shape")
+        return result
+
+    def concatenate(self, other, axis=0):
+        """
+        Concatenate two matrices along an axis
+
+        Args:
+            other: Matrix to append
+            axis: 0 to stack rows, 1 to stack columns
+
+        Returns:
+            a new Matrix, or None if the shapes do not line up or axis is
+            not 0 or 1
+        """
+        rows, cols = self.__rows, self.__cols
+        other_rows, other_cols = other.shape
+        if axis == 0:
+            if cols != other_cols:
+                return None
+            out = array('d', self.__data)
+            out.extend(other.data)
+            return Matrix(rows + other_rows, cols, out)
+        if axis == 1:
+            if rows != other_rows:
+                return None
+            a, b = self.__data, other.data
+            out = array('d')
+            for i in range(rows):
+                out.extend(a[i * cols:(i + 1) * cols])
+                out.extend(b[i * other_cols:(i + 1) * other_cols])
+            return Matrix(rows, cols + other_cols, out)
+        return None
+
+    def mat_mul(self, other):
+        """
+        Multiply two matrices
+
+        other is transposed once so that every entry of the product is
+        the dot product of two contiguous rows, computed at C speed by
+        sum(map(mul, ...)). The operands are unpacked into lists first so
+        each element is boxed once rather than on every use.
+
+        Args:
+            other: Matrix with as many rows as this matrix has columns
+
+        Returns:
+            a new Matrix, or None if the shapes do not line up
+        """
+        rows, n = self.__rows, self.__cols
+        other_rows, cols = other.shape
+        if n != other_rows:
+            return None
+
+        t = other.transpose().data.tolist()
+        columns = [t[j * n:(j + 1) * n] for j in range(cols)]
+        a = self.__data.tolist()
+        out = array('d')
+        for i in range(rows):
+            r = a[i * n:(i + 1) * n]
+            out.extend([sum(map(mul, r, c)) for c in columns])
+        return Matrix(rows, cols, out)
+
+    def __matmul__(self, other):
+        """Multiply two matrices"""
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        result = self.mat_mul(other)
+        if result is None:
+            raise ValueError("matrix shapes are not aligned")
+        return result
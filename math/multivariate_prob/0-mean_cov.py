@@ -1,40 +1,263 @@
 #!/usr/bin/env python3
 """Calculate mean and covariance of a data set"""
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 
+# Rows are read CHUNK_ELEMENTS / d at a time, bounding the temporaries
+CHUNK_ELEMENTS = 1 << 22
 
-def mean_cov(X):
+
+class CovarianceAccumulator:
+    """
+    Running count, mean and centered scatter matrix of a stream of rows
+
+    Each block of rows is summarized on its own and folded in with the
+    pairwise update of Chan et al.:
+        M2 = M2_a + M2_b + delta^T x delta x n_a x n_b / n
+    where delta is the difference of the two means. Accumulators built
+    on different parts of the data can be merged the same way.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator"""
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+
+    def update(self, X):
+        """
+        Add a block of rows
+
+        Args:
+            X: numpy.ndarray of shape (m, d)
+
+        Raises:
+            TypeError: If X is not a 2D numpy.ndarray
+            ValueError: If d differs from the rows added before
+        """
+        if not isinstance(X, np.ndarray) or len(X.shape) != 2:
+            raise TypeError("X must be a 2D numpy.ndarray")
+        if X.shape[0] == 0:
+            return
+
+        block = CovarianceAccumulator()
+        block.count = X.shape[0]
+        block.mean = np.mean(X, axis=0, keepdims=True)
+        X_centered = X - block.mean
+        block.m2 = np.dot(X_centered.T, X_centered)
+        self.merge(block)
+
+    def merge(self, other):
+        """
+        Add the rows summarized by another accumulator
+
+        Args:
+            other: CovarianceAccumulator to fold into this one
+
+        Raises:
+            ValueError: If the two accumulators have a different d
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            return
+        if other.mean.shape != self.mean.shape:
+            raise ValueError("all blocks must have the same number of "
+                             "dimensions")
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2
+        self.m2 += np.dot(delta.T, delta) * (self.count * other.count / count)
+        self.mean += delta * (other.count / count)
+        self.count = count
+
+    def result(self):
+        """
+        Return the mean and the Bessel-corrected covariance
+
+        Returns:
+            mean: numpy.ndarray of shape (1, d)
+            cov: numpy.ndarray of shape (d, d)
+
+        Raises:
+            ValueError: If fewer than 2 rows were added
+        """
+        if self.count < 2:
+            raise ValueError("X must contain multiple data points")
+        return self.mean.copy(), self.m2 / (self.count - 1)
+
+
+def _open_source(source):
+    """
+    Open the (n, d) array described by parallel_stats in a worker
+
+    Args:
+        source: tuple (kind, location, dtype, shape, offset, order)
+
+    Returns:
+        tuple of (X, handle) where handle must be kept open while X is
+        in use (the SharedMemory block, or None for a memmap)
+    """
+    kind, location, dtype, shape, offset, order = source
+    if kind == 'memmap':
+        X = np.memmap(location, dtype=dtype, mode='r', offset=offset,
+                      shape=shape, order=order)
+        return X, None
+
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=location)
+    X = np.ndarray(shape, dtype=dtype, buffer=shm.buf, order=order)
+    return X, shm
+
+
+def _shard_stats(source, start, stop):
+    """
+    Accumulate rows start:stop of a shared array in a worker process
+
+    Args:
+        source: description of the array, see _open_source
+        start: first row of the shard
+        stop: row after the last row of the shard
+
+    Returns:
+        tuple of (count, mean, m2) for the shard
+    """
+    X, shm = _open_source(source)
+    try:
+        acc = CovarianceAccumulator()
+        step = max(1, CHUNK_ELEMENTS // max(X.shape[1], 1))
+        for i in range(start, stop, step):
+            acc.update(X[i:min(i + step, stop)])
+        return acc.count, acc.mean, acc.m2
+    finally:
+        del X
+        if shm is not None:
+            shm.close()
+
+
+def _memmap_source(X):
+    """
+    Describe X by its file if it is a whole memory-mapped array
+
+    Args:
+        X: numpy.ndarray of shape (n, d)
+
+    Returns:
+        source tuple for _open_source, or None if X cannot be reopened
+        from its file without a copy
+    """
+    root = X
+    if not isinstance(root.base, mmap.mmap):
+        root = X.base
+    if (not isinstance(root, np.memmap) or root.filename is None or
+            not isinstance(root.base, mmap.mmap) or X.size != root.size or
+            X.ctypes.data != root.ctypes.data):
+        return None
+    if X.flags.c_contiguous:
+        order = 'C'
+    elif X.flags.f_contiguous:
+        order = 'F'
+    else:
+        return None
+    return ('memmap', root.filename, X.dtype.str, X.shape, root.offset,
+            order)
+
+
+def parallel_stats(X, workers):
+    """
+    Accumulate the rows of X across a pool of worker processes
+
+    The rows are split into contiguous shards, a few per worker. A
+    memory-mapped X is reopened from its file by every worker; any other
+    X is copied once into shared memory. Each worker returns the
+    (count, mean, M2) of its shard and the shards are merged in order.
+
+    Args:
+        X: numpy.ndarray (or numpy.memmap) of shape (n, d)
+        workers: number of worker processes
+
+    Returns:
+        CovarianceAccumulator holding every row of X
+    """
+    n = X.shape[0]
+    shards = min(n, 4 * workers) or 1
+    bounds = [n * i // shards for i in range(shards + 1)]
+
+    source = _memmap_source(X)
+    shm = None
+    if source is None:
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(X.nbytes, 1))
+        shared = np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)
+        shared[...] = X
+        del shared
+        source = ('shm', shm.name, X.dtype.str, X.shape, 0, 'C')
+
+    acc = CovarianceAccumulator()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_shard_stats, source, bounds[i],
+                                   bounds[i + 1]) for i in range(shards)]
+            for future in futures:
+                shard = CovarianceAccumulator()
+                shard.count, shard.mean, shard.m2 = future.result()
+                acc.merge(shard)
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    return acc
+
+
+def mean_cov(X, workers=None):
     """
     Calculate the mean and covariance of a data set
 
+    The rows are read in chunks and merged, so peak memory beyond X is a
+    single chunk, and X may be a numpy.memmap larger than memory. With
+    workers > 1 the rows of an array are split across that many
+    processes (see parallel_stats).
+
     Args:
-        X: numpy.ndarray of shape (n, d) containing the data set
+        X: numpy.ndarray (or numpy.memmap) of shape (n, d) containing the
+           data set, or an iterable of numpy.ndarrays of shape (m_i, d)
+           holding consecutive blocks of rows
            n is the number of data points
            d is the number of dimensions in each data point
+        workers: number of processes for an array X, or None to use the
+                 calling process only
 
     Returns:
         mean: numpy.ndarray of shape (1, d) containing the mean
         cov: numpy.ndarray of shape (d, d) containing the covariance matrix
 
     Raises:
-        TypeError: If X is not a 2D numpy.ndarray
+        TypeError: If X is not a 2D numpy.ndarray or an iterable of them
         ValueError: If n is less than 2
     """
-    if not isinstance(X, np.ndarray) or len(X.shape) != 2:
-        raise TypeError("X must be a 2D numpy.ndarray")
-
-    n, d = X.shape
+    acc = CovarianceAccumulator()
 
-    if n < 2:
-        raise ValueError("X must contain multiple data points")
+    if isinstance(X, np.ndarray):
+        if len(X.shape) != 2:
+            raise TypeError("X must be a 2D numpy.ndarray")
+        n, d = X.shape
+        if n < 2:
+            raise ValueError("X must contain multiple data points")
+        if workers is not None and workers > 1:
+            return parallel_stats(X, workers).result()
+        step = max(1, CHUNK_ELEMENTS // max(d, 1))
+        for start in range(0, n, step):
+            acc.update(X[start:start + step])
+        return acc.result()
 
-    # Calculate mean
-    mean = np.mean(X, axis=0, keepdims=True)
-
-    # Calculate covariance matrix
-    # Cov = (1/(n-1)) * (X - mean)^T * (X - mean)
-    # Using sample covariance (Bessel's correction)
-    X_centered = X - mean
-    cov = np.dot(X_centered.T, X_centered) / (n - 1)
-
-    return mean, cov
+    if not hasattr(X, '__iter__'):
+        raise TypeError("X must be a 2D numpy.ndarray")
+    for block in X:
+        acc.update(block)
+    return acc.result()
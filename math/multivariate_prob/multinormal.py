@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 """Multivariate Normal distribution class"""
+import os
+from importlib.util import module_from_spec, spec_from_file_location
 import numpy as np
+mean_cov = __import__('0-mean_cov').mean_cov
+
+# The chunked sampling helpers are shared with the distributions of
+# math/probability
+_spec = spec_from_file_location('sampling', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, 'probability',
+    'sampling.py'))
+sampling = module_from_spec(_spec)
+_spec.loader.exec_module(sampling)
 
 
 class MultiNormal:
     """Represents a Multivariate Normal distribution"""
 
-    def __init__(self, data):
+    def __init__(self, data, workers=None):
         """
         Initialize MultiNormal distribution
 
@@ -14,6 +25,9 @@ class MultiNormal:
             data: numpy.ndarray of shape (d, n) containing the data set
                   n is the number of data points
                   d is the number of dimensions in each data point
+            workers: number of processes used to compute the mean and
+                     covariance (see mean_cov), or None to use the
+                     calling process only
 
         Raises:
             TypeError: If data is not a 2D numpy.ndarray
@@ -27,6 +41,12 @@ class MultiNormal:
         if n < 2:
             raise ValueError("data must contain multiple data points")
 
+        if workers is not None and workers > 1:
+            mean, self.cov = mean_cov(data.T, workers)
+            self.mean = mean.T
+            self.__factor = None
+            return
+
         # Calculate mean - shape (d, 1)
         self.mean = np.mean(data, axis=1, keepdims=True)
 
@@ -36,48 +56,139 @@ class MultiNormal:
         data_centered = data - self.mean
         self.cov = np.dot(data_centered, data_centered.T) / (n - 1)
 
-    def pdf(self, x):
+        self.__factor = None
+
+    def _factor(self):
+        """
+        Factor the covariance matrix, or reuse the previous factors
+
+        The factors are recomputed only if self.cov has been reassigned
+        since the last call; modifying it in place is not detected.
+
+        Returns:
+            tuple of (L, L_inv, log_det) where cov = L x L^T, L_inv is the
+            inverse of the lower triangular L and log_det is log |cov|
+        """
+        if self.__factor is None or self.__factor[0] is not self.cov:
+            L = np.linalg.cholesky(self.cov)
+            L_inv = np.linalg.inv(L)
+            log_det = 2 * np.sum(np.log(np.diag(L)))
+            self.__factor = (self.cov, L, L_inv, log_det)
+        return self.__factor[1:]
+
+    def _draw(self, rng, size):
+        """
+        Draw size points as mean + L x z with z standard normal
+
+        z is drawn one point (d values) at a time, so a seeded generator
+        gives the same points however the draws are split into chunks,
+        up to rounding in the last bit of the matrix product.
+
+        Args:
+            rng: numpy.random.Generator
+            size: number of points
+
+        Returns:
+            numpy.ndarray of shape (d, size)
         """
-        Calculate the PDF at a data point
+        L = self._factor()[0]
+        z = rng.standard_normal((size, self.mean.shape[0]))
+        return np.dot(L, z.T) + self.mean
+
+    def sample(self, n, rng=None):
+        """
+        Draw random points from the distribution
+
+        The points are generated sampling.CHUNK_SIZE at a time into the
+        output with the cached Cholesky factor, so the covariance is
+        never factored again and no temporary exceeds one chunk.
 
         Args:
-            x: numpy.ndarray of shape (d, 1) containing the data point
+            n: number of points
+            rng: numpy.random.Generator, seed or None for a fresh generator
 
         Returns:
-            The value of the PDF at x
+            numpy.ndarray of shape (d, n)
+
+        Raises:
+            TypeError: If n is not an integer
+            ValueError: If n is negative
+        """
+        return sampling.sample(self._draw, n, rng, axis=1)
+
+    def sample_chunks(self, n, chunk_size=sampling.CHUNK_SIZE, rng=None):
+        """
+        Draw random points from the distribution as a stream of chunks
+
+        Only one chunk is held in memory at a time, so n may be far larger
+        than what fits in memory.
+
+        Args:
+            n: total number of points
+            chunk_size: maximum number of points in each chunk
+            rng: numpy.random.Generator, seed or None for a fresh generator
+
+        Returns:
+            generator of numpy.ndarrays of shape (d, m) with
+            m <= chunk_size
+
+        Raises:
+            TypeError: If n or chunk_size is not an integer
+            ValueError: If n is negative or chunk_size is less than 1
+        """
+        return sampling.sample_chunks(self._draw, n, chunk_size, rng)
+
+    def logpdf(self, x):
+        """
+        Calculate the log of the PDF at one or more data points
+
+        log f(x) = -(d log 2π + log |Σ| + |L^-1 (x - μ)|²) / 2 with the
+        cached Cholesky factor L of Σ, so a batch of n points costs one
+        (d, d) x (d, n) product.
+
+        Args:
+            x: numpy.ndarray of shape (d, 1) containing a data point, or
+               of shape (d, n) containing n data points
+
+        Returns:
+            The value of the log PDF at x for a single point, or a
+            numpy.ndarray of shape (n,) of values for n points
 
         Raises:
             TypeError: If x is not a numpy.ndarray
-            ValueError: If x is not of shape (d, 1)
+            ValueError: If x is not of shape (d, 1) or (d, n)
         """
         if not isinstance(x, np.ndarray):
             raise TypeError("x must be a numpy.ndarray")
 
         d = self.mean.shape[0]
 
-        if x.shape != (d, 1):
+        if len(x.shape) != 2 or x.shape[0] != d or x.shape[1] < 1:
             raise ValueError("x must have the shape ({}, 1)".format(d))
 
-        # PDF formula for multivariate normal:
-        # f(x) = (1 / sqrt((2π)^d * |Σ|)) * exp(-0.5 * (x-μ)^T * Σ^-1 * (x-μ))
-
-        # Calculate determinant of covariance matrix
-        det_cov = np.linalg.det(self.cov)
+        _, L_inv, log_det = self._factor()
+        z = np.dot(L_inv, x - self.mean)
+        log_pdf = -0.5 * (d * np.log(2 * np.pi) + log_det +
+                          np.sum(z * z, axis=0))
 
-        # Calculate inverse of covariance matrix
-        inv_cov = np.linalg.inv(self.cov)
+        if x.shape[1] == 1:
+            return log_pdf[0]
+        return log_pdf
 
-        # Calculate (x - mean)
-        x_centered = x - self.mean
-
-        # Calculate the exponent: -0.5 * (x-μ)^T * Σ^-1 * (x-μ)
-        exponent = -0.5 * np.dot(np.dot(x_centered.T, inv_cov), x_centered)
+    def pdf(self, x):
+        """
+        Calculate the PDF at one or more data points
 
-        # Calculate the coefficient: 1 / sqrt((2π)^d * |Σ|)
-        coefficient = 1 / np.sqrt(((2 * np.pi) ** d) * det_cov)
+        Args:
+            x: numpy.ndarray of shape (d, 1) containing a data point, or
+               of shape (d, n) containing n data points
 
-        # Calculate PDF
-        pdf_value = coefficient * np.exp(exponent)
+        Returns:
+            The value of the PDF at x for a single point, or a
+            numpy.ndarray of shape (n,) of values for n points
 
-        # Return scalar value
-        return pdf_value[0][0]
+        Raises:
+            TypeError: If x is not a numpy.ndarray
+            ValueError: If x is not of shape (d, 1) or (d, n)
+        """
+        return np.exp(self.logpdf(x))
@@ -1,19 +1,30 @@
 #!/usr/bin/env python3
 """Binomial distribution class"""
+import math
 
+RunningStats = __import__('running_stats').RunningStats
+RunningFitMixin = __import__('running_stats').RunningFitMixin
+SamplingMixin = __import__('sampling').SamplingMixin
 
-class Binomial:
+
+class Binomial(RunningFitMixin, SamplingMixin):
     """Represents a binomial distribution"""
 
-    def __init__(self, data=None, n=1, p=0.5):
+    def __init__(self, data=None, n=1, p=0.5, log_table=False):
         """
         Initialize Binomial distribution
 
         Args:
-            data: list of data to estimate the distribution
+            data: list, numpy.ndarray or any iterable of data to
+                  estimate the distribution, read in a single pass
             n: number of Bernoulli trials
             p: probability of success
+            log_table: True to precompute log(i!) for i from 0 to n, so
+                       that every later PMF looks them up instead of
+                       calling math.lgamma
         """
+        self._stats = RunningStats()
+        self._log_table = None
         if data is None:
             if n <= 0:
                 raise ValueError("n must be a positive value")
@@ -22,85 +33,210 @@ class Binomial:
             self.n = int(n)
             self.p = float(p)
         else:
-            if not isinstance(data, list):
+            if not RunningStats.accepts(data):
                 raise TypeError("data must be a list")
-            if len(data) < 2:
+            self._stats.update_many(data)
+            if self._stats.count < 2:
                 raise ValueError("data must contain multiple values")
+            self._fit()
+
+        if log_table:
+            self._build_log_table()
+
+    def _fit(self):
+        """Set n and p from the running stats"""
+        mean = self._stats.mean
+        variance = self._stats.variance
 
-            # Calculate mean and variance
-            mean = sum(data) / len(data)
-            variance = sum((x - mean) ** 2 for x in data) / len(data)
+        # For binomial: mean = n*p, variance = n*p*(1-p)
+        # From variance/mean = (1-p), we can find p
+        # p = 1 - (variance / mean)
+        p = 1 - (variance / mean)
 
-            # For binomial: mean = n*p, variance = n*p*(1-p)
-            # From variance/mean = (1-p), we can find p
-            # p = 1 - (variance / mean)
-            p = 1 - (variance / mean)
+        # From mean = n*p, we can find n
+        # n = mean / p
+        n = mean / p
 
-            # From mean = n*p, we can find n
-            # n = mean / p
-            n = mean / p
+        # Round n to nearest integer
+        self.n = round(n)
 
-            # Round n to nearest integer
-            self.n = round(n)
+        # Recalculate p with rounded n
+        self.p = mean / self.n
 
-            # Recalculate p with rounded n
-            self.p = mean / self.n
+        if self._log_table is not None:
+            self._build_log_table()
+
+    def _build_log_table(self):
+        """Precompute log(i!) for i from 0 to n"""
+        self._log_table = [math.lgamma(i + 1) for i in range(self.n + 1)]
+
+    def _draw(self, rng, size):
+        """Draw size values with a numpy.random.Generator"""
+        return rng.binomial(self.n, self.p, size)
 
     def pmf(self, k):
         """
         Calculate the PMF for a given number of successes
 
         Args:
-            k: number of successes
+            k: number of successes, or an array-like of them
 
         Returns:
-            PMF value for k
+            PMF value for k, or a numpy.ndarray of values for an array
         """
+        if isinstance(k, (list, tuple)) or getattr(k, 'ndim', 0):
+            return self._pmf_array(k)
+
         k = int(k)
         if k < 0 or k > self.n:
             return 0
 
-        # PMF formula: P(X = k) = C(n,k) * p^k * (1-p)^(n-k)
-        # where C(n,k) = n! / (k! * (n-k)!)
+        return math.exp(self.logpmf(k))
+
+    def _log_factorial(self, i):
+        """
+        Calculate log(i!) for 0 <= i <= n
+
+        Args:
+            i: non-negative integer
+
+        Returns:
+            log(i!), read from the table when there is one
+        """
+        table = self._log_table
+        if table is not None and len(table) == self.n + 1:
+            return table[i]
+        return math.lgamma(i + 1)
 
-        # Calculate C(n, k) - binomial coefficient
-        n_factorial = 1
-        for i in range(1, self.n + 1):
-            n_factorial *= i
+    def logpmf(self, k):
+        """
+        Calculate the logarithm of the PMF in O(1)
 
-        k_factorial = 1
-        for i in range(1, k + 1):
-            k_factorial *= i
+        log P(X = k) = log n! - log k! - log (n-k)! + k log p
+                       + (n-k) log (1-p)
 
-        nk_factorial = 1
-        for i in range(1, self.n - k + 1):
-            nk_factorial *= i
+        Args:
+            k: number of successes, or an array-like of them
 
-        binomial_coeff = n_factorial / (k_factorial * nk_factorial)
+        Returns:
+            log PMF value for k (-inf outside 0..n), or a numpy.ndarray
+            of values for an array
+        """
+        if isinstance(k, (list, tuple)) or getattr(k, 'ndim', 0):
+            return self._logpmf_array(k)
 
-        pmf_value = binomial_coeff * (self.p ** k)
-        pmf_value = pmf_value * ((1 - self.p) ** (self.n - k))
-        return pmf_value
+        k = int(k)
+        if k < 0 or k > self.n:
+            return -math.inf
+
+        n = self.n
+        log_coeff = (self._log_factorial(n) - self._log_factorial(k) -
+                     self._log_factorial(n - k))
+        return (log_coeff + k * math.log(self.p) +
+                (n - k) * math.log1p(-self.p))
 
     def cdf(self, k):
         """
         Calculate the CDF for a given number of successes
 
         Args:
-            k: number of successes
+            k: number of successes, or an array-like of them
 
         Returns:
-            CDF value for k
+            CDF value for k, or a numpy.ndarray of values for an array
         """
+        if isinstance(k, (list, tuple)) or getattr(k, 'ndim', 0):
+            return self._cdf_array(k)
+
         k = int(k)
         if k < 0:
             return 0
         if k > self.n:
             return 1
 
-        # CDF is the sum of PMF values from 0 to k
-        cdf_value = 0
-        for i in range(k + 1):
-            cdf_value += self.pmf(i)
+        # Sum the terms by the recurrence
+        #   P(i - 1) / P(i) = i / (n - i + 1) * (1 - p) / p
+        # moving away from the mode, where they only shrink, and stop once
+        # they no longer change the sum. Above the mean the upper tail is
+        # summed instead and subtracted from 1.
+        n, p = self.n, self.p
+        odds = p / (1 - p)
+        if k < n * p:
+            total = term = 1.0
+            for i in range(k, 0, -1):
+                term *= i / ((n - i + 1) * odds)
+                total += term
+                if term < total * 1e-17:
+                    break
+            return math.exp(self.logpmf(k)) * total
+
+        if k == n:
+            return 1.0
+        total = term = 1.0
+        for i in range(k + 1, n):
+            term *= (n - i) / (i + 1) * odds
+            total += term
+            if term < total * 1e-17:
+                break
+        return 1 - math.exp(self.logpmf(k + 1)) * total
+
+    def _logpmf_array(self, k):
+        """
+        Calculate the log PMF for an array of numbers of successes at once
+
+        The log-factorials are evaluated only for the distinct values of
+        k, so the cost does not depend on n.
+
+        Args:
+            k: array-like of numbers of successes
+
+        Returns:
+            numpy.ndarray of log PMF values with the shape of k
+        """
+        import numpy as np
+
+        k = np.trunc(np.asarray(k, dtype=float))
+        inside = (k >= 0) & (k <= self.n)
+        values, inverse = np.unique(np.where(inside, k, 0),
+                                    return_inverse=True)
+        values = values.astype(np.int64)
+        log_factorial = np.vectorize(self._log_factorial, otypes=[float])
+        n = self.n
+        log_pmf = (log_factorial(n) - log_factorial(values) -
+                   log_factorial(n - values) + values * math.log(self.p) +
+                   (n - values) * math.log1p(-self.p))
+        return np.where(inside, log_pmf[inverse].reshape(k.shape), -np.inf)
+
+    def _pmf_array(self, k):
+        """
+        Calculate the PMF for an array of numbers of successes at once
+
+        Args:
+            k: array-like of numbers of successes
+
+        Returns:
+            numpy.ndarray of PMF values with the shape of k
+        """
+        import numpy as np
+
+        return np.exp(self._logpmf_array(k))
+
+    def _cdf_array(self, k):
+        """
+        Calculate the CDF for an array of numbers of successes at once
+
+        The CDF is summed once for each distinct value of k, so the cost
+        depends on the number of values requested rather than on n.
+
+        Args:
+            k: array-like of numbers of successes
+
+        Returns:
+            numpy.ndarray of CDF values with the shape of k
+        """
+        import numpy as np
 
-        return cdf_value
+        k = np.trunc(np.asarray(k, dtype=float))
+        values, inverse = np.unique(k, return_inverse=True)
+        cdf = np.vectorize(self.cdf, otypes=[float])(values)
+        return np.clip(cdf[inverse].reshape(k.shape), 0., 1.)
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Exponential distribution class"""
+RunningStats = __import__('running_stats').RunningStats
+RunningFitMixin = __import__('running_stats').RunningFitMixin
+SamplingMixin = __import__('sampling').SamplingMixin
 
 
-class Exponential:
+class Exponential(RunningFitMixin, SamplingMixin):
     """Represents an exponential distribution"""
 
     def __init__(self, data=None, lambtha=1.):
@@ -10,32 +13,48 @@ class Exponential:
         Initialize Exponential distribution
 
         Args:
-            data: list of data to estimate the distribution
+            data: list, numpy.ndarray or any iterable of data to
+                  estimate the distribution, read in a single pass
             lambtha: expected number of occurrences in a given time frame
         """
+        self._stats = RunningStats()
         if data is None:
             if lambtha <= 0:
                 raise ValueError("lambtha must be a positive value")
             self.lambtha = float(lambtha)
         else:
-            if not isinstance(data, list):
+            if not RunningStats.accepts(data):
                 raise TypeError("data must be a list")
-            if len(data) < 2:
+            self._stats.update_many(data)
+            if self._stats.count < 2:
                 raise ValueError("data must contain multiple values")
-            # For exponential distribution, lambtha = 1 / mean
-            mean = sum(data) / len(data)
-            self.lambtha = 1 / mean
+            self._fit()
+
+    def _fit(self):
+        """Set lambtha from the running stats: lambtha = 1 / mean"""
+        self.lambtha = 1 / self._stats.mean
+
+    def _draw(self, rng, size):
+        """Draw size values with a numpy.random.Generator"""
+        return rng.exponential(1 / self.lambtha, size)
 
     def pdf(self, x):
         """
         Calculate the PDF for a given time period
 
         Args:
-            x: time period
+            x: time period, or an array-like of them
 
         Returns:
-            PDF value for x
+            PDF value for x, or a numpy.ndarray of values for an array
         """
+        if isinstance(x, (list, tuple)) or getattr(x, 'ndim', 0):
+            import numpy as np
+
+            x = np.asarray(x, dtype=float)
+            return np.where(x < 0, 0.,
+                            self.lambtha * np.exp(-self.lambtha * x))
+
         if x < 0:
             return 0
 
@@ -49,11 +68,17 @@ class Exponential:
         Calculate the CDF for a given time period
 
         Args:
-            x: time period
+            x: time period, or an array-like of them
 
         Returns:
-            CDF value for x
+            CDF value for x, or a numpy.ndarray of values for an array
         """
+        if isinstance(x, (list, tuple)) or getattr(x, 'ndim', 0):
+            import numpy as np
+
+            x = np.asarray(x, dtype=float)
+            return np.where(x < 0, 0., -np.expm1(-self.lambtha * x))
+
         if x < 0:
             return 0
 
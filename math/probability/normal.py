@@ -1,8 +1,33 @@
 #!/usr/bin/env python3
 """Normal distribution class"""
-
-
-class Normal:
+import math
+
+RunningStats = __import__('running_stats').RunningStats
+RunningFitMixin = __import__('running_stats').RunningFitMixin
+SamplingMixin = __import__('sampling').SamplingMixin
+
+SQRT2 = math.sqrt(2)
+
+# ppf skips its Halley step once z²/2 exceeds this, as exp(z²/2) would
+# overflow
+HALLEY_LIMIT = 700
+
+# Coefficients of Acklam's approximation of the normal quantile function
+ACKLAM_LOW = 0.02425
+ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02,
+            -2.759285104469687e+02, 1.383577518672690e+02,
+            -3.066479806614716e+01, 2.506628277459239e+00)
+ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02,
+            -1.556989798598866e+02, 6.680131188771972e+01,
+            -1.328068155288572e+01)
+ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01,
+            -2.400758277161838e+00, -2.549732539343734e+00,
+            4.374664141464968e+00, 2.938163982698783e+00)
+ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01,
+            2.445134137142996e+00, 3.754408661907416e+00)
+
+
+class Normal(RunningFitMixin, SamplingMixin):
     """Represents a normal distribution"""
 
     def __init__(self, data=None, mean=0., stddev=1.):
@@ -10,27 +35,33 @@ class Normal:
         Initialize Normal distribution
 
         Args:
-            data: list of data to estimate the distribution
+            data: list, numpy.ndarray or any iterable of data to
+                  estimate the distribution, read in a single pass
             mean: mean of the distribution
             stddev: standard deviation of the distribution
         """
+        self._stats = RunningStats()
         if data is None:
             if stddev <= 0:
                 raise ValueError("stddev must be a positive value")
             self.mean = float(mean)
             self.stddev = float(stddev)
         else:
-            if not isinstance(data, list):
+            if not RunningStats.accepts(data):
                 raise TypeError("data must be a list")
-            if len(data) < 2:
+            self._stats.update_many(data)
+            if self._stats.count < 2:
                 raise ValueError("data must contain multiple values")
+            self._fit()
 
-            # Calculate mean
-            self.mean = sum(data) / len(data)
+    def _fit(self):
+        """Set the mean and standard deviation from the running stats"""
+        self.mean = self._stats.mean
+        self.stddev = self._stats.variance ** 0.5
 
-            # Calculate standard deviation
-            variance = sum((x - self.mean) ** 2 for x in data) / len(data)
-            self.stddev = variance ** 0.5
+    def _draw(self, rng, size):
+        """Draw size values with a numpy.random.Generator"""
+        return rng.normal(self.mean, self.stddev, size)
 
     def z_score(self, x):
         """
@@ -61,11 +92,17 @@ class Normal:
         Calculate the PDF for a given x-value
 
         Args:
-            x: x-value
+            x: x-value, or an array-like of them
 
         Returns:
-            PDF value for x
+            PDF value for x, or a numpy.ndarray of values for an array
         """
+        if isinstance(x, (list, tuple)) or getattr(x, 'ndim', 0):
+            import numpy as np
+
+            z = (np.asarray(x, dtype=float) - self.mean) / self.stddev
+            return np.exp(-z * z / 2) / (self.stddev * np.sqrt(2 * np.pi))
+
         # PDF formula: f(x) = (1 / (σ * √(2π))) * e^(-(x-μ)²/(2σ²))
         pi = 3.1415926536
         e = 2.7182818285
@@ -76,65 +113,240 @@ class Normal:
 
         return pdf_value
 
+    def _map(self, function, x):
+        """
+        Apply a function of one float to every element of an array-like
+
+        Args:
+            function: function taking and returning a float
+            x: array-like of floats
+
+        Returns:
+            numpy.ndarray of results with the shape of x
+        """
+        import numpy as np
+
+        x = np.asarray(x, dtype=float)
+        values = np.fromiter(map(function, x.ravel().tolist()), float,
+                             x.size)
+        return values.reshape(x.shape)
+
     def cdf(self, x):
         """
         Calculate the CDF for a given x-value
 
+        CDF(x) = erfc(-(x - μ) / (σ√2)) / 2, which keeps full relative
+        accuracy far into the lower tail.
+
         Args:
-            x: x-value
+            x: x-value, or an array-like of them
 
         Returns:
-            CDF value for x
+            CDF value for x, or a numpy.ndarray of values for an array
         """
-        # CDF formula using error function approximation
-        # CDF(x) = (1/2) * [1 + erf((x - μ) / (σ * √2))]
+        if isinstance(x, (list, tuple)) or getattr(x, 'ndim', 0):
+            import numpy as np
+
+            w = (self.mean - np.asarray(x, dtype=float)) / (
+                self.stddev * SQRT2)
+            return self._map(math.erfc, w) / 2
 
-        pi = 3.1415926535897932
+        return math.erfc((self.mean - x) / (self.stddev * SQRT2)) / 2
 
-        # Calculate the value for the error function
-        value = (x - self.mean) / (self.stddev * (2 ** 0.5))
+    def sf(self, x):
+        """
+        Calculate the survival function 1 - CDF for a given x-value
 
-        # Using a high-precision erf approximation
-        # erf(x) ≈ (2/√π) * ∫₀ˣ e^(-t²) dt
-        # Using numerical integration with Simpson's method
+        Computed directly as erfc((x - μ) / (σ√2)) / 2 rather than as
+        1 - cdf(x), so it stays accurate in the upper tail.
 
-        # For the error function, we'll use a series expansion
-        erf_value = self._erf(value)
+        Args:
+            x: x-value, or an array-like of them
+
+        Returns:
+            survival function value for x, or a numpy.ndarray of values
+            for an array
+        """
+        if isinstance(x, (list, tuple)) or getattr(x, 'ndim', 0):
+            import numpy as np
 
-        cdf_value = (1 + erf_value) / 2
+            w = (np.asarray(x, dtype=float) - self.mean) / (
+                self.stddev * SQRT2)
+            return self._map(math.erfc, w) / 2
 
-        return cdf_value
+        return math.erfc((x - self.mean) / (self.stddev * SQRT2)) / 2
 
-    def _erf(self, x):
+    def logcdf(self, x):
         """
-        Calculate error function using series expansion
+        Calculate the logarithm of the CDF for a given x-value
+
+        Above z = 0 the CDF is 1 - SF and is taken as log1p(-SF), which
+        keeps the tiny values of the upper tail. Below z = -30 the CDF
+        gets close to underflow, so the asymptotic expansion
+            log CDF = -z²/2 - log(-z) - log(2π)/2
+                      + log(1 - 1/z² + 3/z⁴ - 15/z⁶ + 105/z⁸)
+        is used instead.
 
         Args:
-            x: input value
+            x: x-value, or an array-like of them
 
         Returns:
-            erf(x)
+            log CDF value for x, or a numpy.ndarray of values for an array
         """
-        # Use the formula: erf(x) = (2/√π) * sum from n=0 to
-        # infinity of ((-1)^n * x^(2n+1)) / (n! * (2n+1))
+        if isinstance(x, (list, tuple)) or getattr(x, 'ndim', 0):
+            return self._logcdf_array(x)
+
+        z = self.z_score(x)
+        if z > 0:
+            return math.log1p(-math.erfc(z / SQRT2) / 2)
+        if z > -30:
+            return math.log(math.erfc(-z / SQRT2) / 2)
 
-        pi = 3.1415926535897932
-        e = 2.7182818284590452
+        r = 1 / (z * z)
+        series = 1 - r * (1 - 3 * r * (1 - 5 * r * (1 - 7 * r)))
+        return (-z * z / 2 - math.log(-z) - math.log(2 * math.pi) / 2 +
+                math.log(series))
 
-        # For better accuracy, use Abramowitz and Stegun formula
-        sign = 1 if x >= 0 else -1
-        x = abs(x)
+    def ppf(self, p):
+        """
+        Calculate the x-value whose CDF is p (the quantile function)
 
-        # Constants
-        a1 = 0.254829592
-        a2 = -0.284496736
-        a3 = 1.421413741
-        a4 = -1.453152027
-        a5 = 1.061405429
-        p = 0.3275911
+        Starts from Acklam's rational approximation of the inverse of
+        the standard normal CDF (relative error below 1.2e-9) and
+        refines it with one Halley step on erfc, which brings it to
+        full double precision. The step is skipped for |z| > 37.4
+        (p below about 1e-306), where exp(z²/2) would overflow and erfc
+        is already subnormal.
 
-        t = 1.0 / (1.0 + p * x)
-        poly = ((((a5 * t + a4) * t + a3) * t + a2) * t + a1) * t
-        y = 1.0 - poly * (e ** (-x * x))
+        Args:
+            p: probability, or an array-like of them
 
-        return sign * y
+        Returns:
+            x-value for p (-inf for 0, inf for 1), or a numpy.ndarray of
+            values for an array
+
+        Raises:
+            ValueError: if p is not between 0 and 1
+        """
+        if isinstance(p, (list, tuple)) or getattr(p, 'ndim', 0):
+            return self._ppf_array(p)
+
+        if p < 0 or p > 1:
+            raise ValueError("p must be between 0 and 1")
+        if p == 0:
+            return -math.inf
+        if p == 1:
+            return math.inf
+
+        if p < ACKLAM_LOW:
+            q = math.sqrt(-2 * math.log(p))
+            z = _polyval(ACKLAM_C, q) / (_polyval(ACKLAM_D, q) * q + 1)
+        elif p <= 1 - ACKLAM_LOW:
+            q = p - 0.5
+            r = q * q
+            z = _polyval(ACKLAM_A, r) * q / (_polyval(ACKLAM_B, r) * r + 1)
+        else:
+            q = math.sqrt(-2 * math.log1p(-p))
+            z = -_polyval(ACKLAM_C, q) / (_polyval(ACKLAM_D, q) * q + 1)
+
+        # Halley step: e is CDF(z) - p, measured in the tail nearest z
+        if z * z / 2 > HALLEY_LIMIT:
+            return self.x_value(z)
+        if z < 0:
+            e = math.erfc(-z / SQRT2) / 2 - p
+        else:
+            e = (1 - p) - math.erfc(z / SQRT2) / 2
+        u = e * math.sqrt(2 * math.pi) * math.exp(z * z / 2)
+        z -= u / (1 + z * u / 2)
+
+        return self.x_value(z)
+
+    def _tail(self, z):
+        """
+        Calculate the normal tail probability beyond |z| for an array
+
+        Args:
+            z: numpy.ndarray of z-scores
+
+        Returns:
+            numpy.ndarray of erfc(|z| / √2) / 2, that is CDF(z) for
+            z <= 0 and SF(z) for z > 0
+        """
+        import numpy as np
+
+        return self._map(math.erfc, np.abs(z) / SQRT2) / 2
+
+    def _logcdf_array(self, x):
+        """
+        Calculate the log CDF for an array of x-values at once
+
+        Uses the same three regions as logcdf, selected with numpy.where.
+
+        Args:
+            x: array-like of x-values
+
+        Returns:
+            numpy.ndarray of log CDF values with the shape of x
+        """
+        import numpy as np
+
+        z = (np.asarray(x, dtype=float) - self.mean) / self.stddev
+        tail = self._tail(z)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = 1 / (z * z)
+            series = 1 - r * (1 - 3 * r * (1 - 5 * r * (1 - 7 * r)))
+            asymptotic = (-z * z / 2 - np.log(-z) - math.log(2 * math.pi) / 2
+                          + np.log(series))
+            return np.where(z > 0, np.log1p(-tail),
+                            np.where(z > -30, np.log(tail), asymptotic))
+
+    def _ppf_array(self, p):
+        """
+        Calculate the quantile for an array of probabilities at once
+
+        The three regions of Acklam's approximation are evaluated with
+        numpy.where and the Halley step is applied to the whole array.
+
+        Args:
+            p: array-like of probabilities
+
+        Returns:
+            numpy.ndarray of x-values with the shape of p
+
+        Raises:
+            ValueError: if any p is not between 0 and 1
+        """
+        import numpy as np
+
+        p = np.asarray(p, dtype=float)
+        if np.any((p < 0) | (p > 1)):
+            raise ValueError("p must be between 0 and 1")
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            q = np.sqrt(-2 * np.log(np.where(p < 0.5, p, 1 - p)))
+            tail = _polyval(ACKLAM_C, q) / (_polyval(ACKLAM_D, q) * q + 1)
+            q = p - 0.5
+            r = q * q
+            central = (_polyval(ACKLAM_A, r) * q /
+                       (_polyval(ACKLAM_B, r) * r + 1))
+            z = np.where(p < ACKLAM_LOW, tail,
+                         np.where(p <= 1 - ACKLAM_LOW, central, -tail))
+
+            # Halley step: e is CDF(z) - p, measured in the tail nearest z
+            lower = self._tail(z)
+            e = np.where(z < 0, lower - p, (1 - p) - lower)
+            u = e * math.sqrt(2 * math.pi) * np.exp(z * z / 2)
+            step = np.where(z * z / 2 > HALLEY_LIMIT, 0.,
+                            u / (1 + z * u / 2))
+            z = np.where(np.isfinite(z), z - step, z)
+            z = np.where(p == 0, -np.inf, np.where(p == 1, np.inf, z))
+
+        return self.x_value(z)
+
+
+def _polyval(coefficients, x):
+    """Evaluate a polynomial, highest degree first, by Horner's rule"""
+    result = 0.0
+    for c in coefficients:
+        result = result * x + c
+    return result
@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
 """Poisson distribution class"""
+import math
 
+RunningStats = __import__('running_stats').RunningStats
+RunningFitMixin = __import__('running_stats').RunningFitMixin
+SamplingMixin = __import__('sampling').SamplingMixin
 
-class Poisson:
+# Above this lambtha, cdf uses the incomplete gamma function instead of
+# summing (and caching) the PMF term by term
+LARGE_LAMBTHA = 1000
+
+
+class Poisson(RunningFitMixin, SamplingMixin):
     """Represents a Poisson distribution"""
 
     def __init__(self, data=None, lambtha=1.):
@@ -10,63 +19,217 @@ class Poisson:
         Initialize Poisson distribution
 
         Args:
-            data: list of data to estimate the distribution
+            data: list, numpy.ndarray or any iterable of data to
+                  estimate the distribution, read in a single pass
             lambtha: expected number of occurrences in a given time frame
         """
+        self._stats = RunningStats()
         if data is None:
             if lambtha <= 0:
                 raise ValueError("lambtha must be a positive value")
             self.lambtha = float(lambtha)
         else:
-            if not isinstance(data, list):
+            if not RunningStats.accepts(data):
                 raise TypeError("data must be a list")
-            if len(data) < 2:
+            self._stats.update_many(data)
+            if self._stats.count < 2:
                 raise ValueError("data must contain multiple values")
-            # Calculate lambtha as the mean of the data
-            self.lambtha = float(sum(data) / len(data))
+            self._fit()
+
+        self._cdf_table = None
+
+    def _fit(self):
+        """Set lambtha from the running stats: lambtha = mean"""
+        self.lambtha = float(self._stats.mean)
+
+    def _draw(self, rng, size):
+        """Draw size values with a numpy.random.Generator"""
+        return rng.poisson(self.lambtha, size)
 
     def pmf(self, k):
         """
         Calculate the PMF for a given number of successes
 
         Args:
-            k: number of successes
+            k: number of successes, or an array-like of them
 
         Returns:
-            PMF value for k
+            PMF value for k, or a numpy.ndarray of values for an array
         """
+        if isinstance(k, (list, tuple)) or getattr(k, 'ndim', 0):
+            return self._pmf_array(k)
+
         k = int(k)
         if k < 0:
             return 0
 
-        # PMF formula: P(X = k) = (λ^k * e^(-λ)) / k!
-        e = 2.7182818285
-
-        # Calculate k! (factorial)
-        factorial = 1
-        for i in range(1, k + 1):
-            factorial *= i
-
-        pmf_value = (self.lambtha ** k * e ** (-self.lambtha)) / factorial
-        return pmf_value
+        # PMF formula: P(X = k) = (λ^k * e^(-λ)) / k!, in log space
+        log_pmf = k * math.log(self.lambtha) - self.lambtha
+        return math.exp(log_pmf - math.lgamma(k + 1))
 
     def cdf(self, k):
         """
         Calculate the CDF for a given number of successes
 
         Args:
-            k: number of successes
+            k: number of successes, or an array-like of them
 
         Returns:
-            CDF value for k
+            CDF value for k, or a numpy.ndarray of values for an array
         """
+        if isinstance(k, (list, tuple)) or getattr(k, 'ndim', 0):
+            return self._cdf_array(k)
+
         k = int(k)
         if k < 0:
             return 0
 
-        # CDF is the sum of PMF values from 0 to k
-        cdf_value = 0
-        for i in range(k + 1):
-            cdf_value += self.pmf(i)
+        if self.lambtha > LARGE_LAMBTHA:
+            # P(X <= k) = Q(k + 1, λ), the regularized upper gamma
+            return _gamma_q(k + 1, self.lambtha)
+
+        table = self._cumulative(k)
+        if k < len(table):
+            return table[k]
+        return table[-1]
+
+    def _cumulative(self, k):
+        """
+        Extend the cached CDF table up to k
+
+        The table holds P(X <= i) for i = 0, 1, ..., built with the term
+        recurrence log p(i) = log p(i - 1) + log λ - log i and a running
+        log-sum, so a query for a k already covered is a lookup and a
+        larger k only computes the missing terms. The table stops
+        growing past the mode once the terms no longer change the sum.
+
+        Args:
+            k: non-negative number of successes
+
+        Returns:
+            list of CDF values, of length k + 1 unless it stopped growing
+        """
+        cache = self._cdf_table
+        if cache is None or cache['lambtha'] != self.lambtha:
+            log_term = -self.lambtha
+            cache = {'lambtha': self.lambtha, 'log_term': log_term,
+                     'log_total': log_term, 'table': [math.exp(log_term)],
+                     'done': False}
+            self._cdf_table = cache
+        table = cache['table']
+        if len(table) > k or cache['done']:
+            return table
+
+        log_lambtha = math.log(self.lambtha)
+        log_term, log_total = cache['log_term'], cache['log_total']
+        for i in range(len(table), k + 1):
+            log_term += log_lambtha - math.log(i)
+            if log_term > log_total:
+                log_total = log_term + math.log1p(
+                    math.exp(log_total - log_term))
+            else:
+                log_total += math.log1p(math.exp(log_term - log_total))
+            table.append(min(math.exp(log_total), 1.0))
+            if i > self.lambtha and log_term < log_total - 40:
+                cache['done'] = True
+                break
+        cache['log_term'], cache['log_total'] = log_term, log_total
+        return table
+
+    def _pmf_array(self, k):
+        """
+        Calculate the PMF for an array of numbers of successes at once
+
+        log(k!) is evaluated only for the distinct values of k, so the
+        cost does not depend on how large k is.
+
+        Args:
+            k: array-like of numbers of successes
+
+        Returns:
+            numpy.ndarray of PMF values with the shape of k
+        """
+        import numpy as np
+
+        k = np.trunc(np.asarray(k, dtype=float))
+        values, inverse = np.unique(np.maximum(k, 0), return_inverse=True)
+        log_factorial = np.vectorize(math.lgamma, otypes=[float])(values + 1)
+        pmf = np.exp(values * math.log(self.lambtha) - self.lambtha -
+                     log_factorial)
+        return np.where(k < 0, 0., pmf[inverse].reshape(k.shape))
+
+    def _cdf_array(self, k):
+        """
+        Calculate the CDF for an array of numbers of successes at once
+
+        Above LARGE_LAMBTHA the incomplete gamma function is evaluated
+        once for each distinct value of k.
+
+        Args:
+            k: array-like of numbers of successes
+
+        Returns:
+            numpy.ndarray of CDF values with the shape of k
+        """
+        import numpy as np
+
+        k = np.trunc(np.asarray(k, dtype=float))
+        if self.lambtha > LARGE_LAMBTHA:
+            values, inverse = np.unique(k, return_inverse=True)
+            cdf = np.vectorize(self.cdf, otypes=[float])(values)
+            return cdf[inverse].reshape(k.shape)
+
+        index = np.maximum(k, 0).astype(int)
+        table = np.array(self._cumulative(int(index.max(initial=0))))
+        return np.where(k < 0, 0., table[np.minimum(index, len(table) - 1)])
+
+
+def _gamma_q(a, x):
+    """
+    Calculate the regularized upper incomplete gamma function Q(a, x)
+
+    Uses the power series of P(a, x) = 1 - Q(a, x) for x < a + 1 and the
+    continued fraction of Q(a, x) (modified Lentz method) otherwise, each
+    taking O(sqrt(a)) iterations when x is close to a.
+
+    Args:
+        a: positive shape
+        x: non-negative upper limit
+
+    Returns:
+        Q(a, x)
+    """
+    if x <= 0:
+        return 1.0
+    log_prefactor = a * math.log(x) - x - math.lgamma(a)
+    tiny = 1e-300
+    eps = 1e-16
+
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        while abs(term) > abs(total) * eps:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
 
-        return cdf_value
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    i = 1
+    while True:
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < eps:
+            break
+        i += 1
+    return min(1.0, math.exp(log_prefactor) * h)
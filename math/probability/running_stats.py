@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Running mean and variance for fitting distributions"""
+
+
+class RunningStats:
+    """
+    Count, mean and sum of squared deviations of a stream of values
+
+    Values are folded in one at a time with Welford's algorithm, and two
+    sets of statistics are combined with the pairwise update of Chan et
+    al., so data never has to be held in memory or read twice.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics"""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def variance(self):
+        """Return the population variance of the values seen so far"""
+        return self.m2 / self.count
+
+    @staticmethod
+    def accepts(data):
+        """
+        Check whether data can be fitted
+
+        Args:
+            data: candidate data
+
+        Returns:
+            True for a list, a numpy.ndarray or any other iterable that is
+            not a string, bytes or a mapping
+        """
+        if isinstance(data, (str, bytes, dict)):
+            return False
+        return hasattr(data, '__iter__')
+
+    def update(self, x):
+        """
+        Add one value
+
+        Args:
+            x: the value
+        """
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def update_many(self, data):
+        """
+        Add every value of an iterable in a single pass
+
+        A numpy.ndarray is summarized with vectorized operations and then
+        merged in.
+
+        Args:
+            data: iterable of numbers or numpy.ndarray
+        """
+        if hasattr(data, 'ndim'):
+            if data.size == 0:
+                return
+            other = RunningStats()
+            other.count = int(data.size)
+            other.mean = float(data.mean())
+            other.m2 = float(((data - other.mean) ** 2).sum())
+            self.merge(other)
+            return
+
+        count, mean, m2 = self.count, self.mean, self.m2
+        for x in data:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+        self.count, self.mean, self.m2 = count, mean, m2
+
+    def merge(self, other):
+        """
+        Add the values summarized by another RunningStats
+
+        Args:
+            other: RunningStats to fold into this one
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+
+class RunningFitMixin:
+    """
+    Incremental fitting for a distribution backed by RunningStats
+
+    The class keeps its RunningStats in self._stats and sets its
+    parameters from them in self._fit().
+    """
+
+    def partial_fit(self, data):
+        """
+        Update the fit with more data in a single pass
+
+        Once at least two values have been seen, the parameters are
+        re-estimated from every value seen so far.
+
+        Args:
+            data: list, numpy.ndarray or any iterable of values
+
+        Returns:
+            self
+        """
+        if not RunningStats.accepts(data):
+            raise TypeError("data must be a list")
+        self._stats.update_many(data)
+        if self._stats.count >= 2:
+            self._fit()
+        return self
+
+    def update(self, x):
+        """
+        Update the fit with a single value
+
+        Args:
+            x: the new value
+
+        Returns:
+            self
+        """
+        self._stats.update(x)
+        if self._stats.count >= 2:
+            self._fit()
+        return self
+
+    def merge(self, other):
+        """
+        Combine with a fit made on another part of the data
+
+        Args:
+            other: instance of the same class fitted on other data
+
+        Returns:
+            self, fitted on the values seen by both
+        """
+        self._stats.merge(other._stats)
+        if self._stats.count >= 2:
+            self._fit()
+        return self
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Chunked random sampling for the distribution classes"""
+
+CHUNK_SIZE = 1 << 16
+
+
+def check(n, chunk_size):
+    """
+    Validate the number of draws and the chunk size
+
+    Args:
+        n: total number of draws
+        chunk_size: maximum number of draws in each chunk
+
+    Raises:
+        TypeError: if n or chunk_size is not an integer
+        ValueError: if n is negative or chunk_size is less than 1
+    """
+    if not isinstance(n, int):
+        raise TypeError("n must be an integer")
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if not isinstance(chunk_size, int):
+        raise TypeError("chunk_size must be an integer")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+
+def _chunks(draw, n, chunk_size, rng):
+    """Yield the chunks of sample_chunks once the arguments are checked"""
+    for start in range(0, n, chunk_size):
+        yield draw(rng, min(chunk_size, n - start))
+
+
+def sample_chunks(draw, n, chunk_size=CHUNK_SIZE, rng=None):
+    """
+    Generate n draws as a stream of chunks
+
+    Only one chunk is held in memory at a time, so n may be far larger
+    than what fits in memory. The arguments are checked when this is
+    called, not when the first chunk is requested.
+
+    Args:
+        draw: function (rng, size) returning a numpy.ndarray of size draws
+        n: total number of draws
+        chunk_size: maximum number of draws in each chunk
+        rng: numpy.random.Generator, seed or None for a fresh generator
+
+    Returns:
+        generator of numpy.ndarrays of at most chunk_size draws
+
+    Raises:
+        TypeError: if n or chunk_size is not an integer
+        ValueError: if n is negative or chunk_size is less than 1
+    """
+    import numpy as np
+
+    check(n, chunk_size)
+    return _chunks(draw, n, chunk_size, np.random.default_rng(rng))
+
+
+def sample(draw, n, rng=None, chunk_size=CHUNK_SIZE, axis=0):
+    """
+    Generate n draws into a single array
+
+    The draws are generated chunk by chunk straight into the output, so
+    no temporary larger than a chunk is created.
+
+    Args:
+        draw: function (rng, size) returning a numpy.ndarray holding size
+              draws along axis
+        n: number of draws
+        rng: numpy.random.Generator, seed or None for a fresh generator
+        chunk_size: maximum number of draws generated at once
+        axis: axis of the arrays returned by draw that indexes the draws
+
+    Returns:
+        numpy.ndarray with n draws along axis, of shape (n,) for scalar
+        draws
+
+    Raises:
+        TypeError: if n or chunk_size is not an integer
+        ValueError: if n is negative or chunk_size is less than 1
+    """
+    import numpy as np
+
+    check(n, chunk_size)
+    rng = np.random.default_rng(rng)
+    if n == 0:
+        return draw(rng, 0)
+
+    out = None
+    for start in range(0, n, chunk_size):
+        chunk = draw(rng, min(chunk_size, n - start))
+        if out is None:
+            shape = list(chunk.shape)
+            shape[axis] = n
+            out = np.empty(shape, dtype=chunk.dtype)
+        index = (slice(None),) * (axis % chunk.ndim) + \
+            (slice(start, start + chunk.shape[axis]),)
+        out[index] = chunk
+    return out
+
+
+class SamplingMixin:
+    """
+    Random sampling for a distribution
+
+    The class draws values with self._draw(rng, size), which returns a
+    numpy.ndarray of size values.
+    """
+
+    def sample(self, n, rng=None):
+        """
+        Draw random values from the distribution
+
+        Args:
+            n: number of values
+            rng: numpy.random.Generator, seed or None for a fresh generator
+
+        Returns:
+            numpy.ndarray of shape (n,)
+        """
+        return sample(self._draw, n, rng)
+
+    def sample_chunks(self, n, chunk_size=CHUNK_SIZE, rng=None):
+        """
+        Draw random values from the distribution as a stream of chunks
+
+        Args:
+            n: total number of values, which may exceed available memory
+            chunk_size: maximum number of values in each chunk
+            rng: numpy.random.Generator, seed or None for a fresh generator
+
+        Returns:
+            generator of numpy.ndarrays of at most chunk_size values
+        """
+        return sample_chunks(self._draw, n, chunk_size, rng)
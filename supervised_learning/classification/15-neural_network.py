@@ -8,16 +8,19 @@ import matplotlib.pyplot as plt
 class NeuralNetwork:
     """A neural network with one hidden layer performing binary classification."""
 
-    def __init__(self, nx, nodes):
+    def __init__(self, nx, nodes, dtype='float64'):
         """
         Initialize the neural network.
         
         Args:
             nx: Number of input features
             nodes: Number of nodes found in the hidden layer
+            dtype: Floating point type of the weights and activations
+                   ('float32'/'float64')
             
         Raises:
-            TypeError: If nx or nodes is not an integer
+            TypeError: If nx or nodes is not an integer, or dtype is not
+                       float32/float64
             ValueError: If nx or nodes is less than 1
         """
         if not isinstance(nx, int):
@@ -28,11 +31,14 @@ class NeuralNetwork:
             raise TypeError("nodes must be an integer")
         if nodes < 1:
             raise ValueError("nodes must be a positive integer")
+        if dtype not in ['float32', 'float64', np.float32, np.float64]:
+            raise TypeError("dtype must be float32 or float64")
         
-        self.__W1 = np.random.randn(nodes, nx)
-        self.__b1 = np.zeros((nodes, 1))
+        self.__dtype = np.dtype(dtype)
+        self.__W1 = np.random.randn(nodes, nx).astype(self.__dtype)
+        self.__b1 = np.zeros((nodes, 1), dtype=self.__dtype)
         self.__A1 = 0
-        self.__W2 = np.random.randn(1, nodes)
+        self.__W2 = np.random.randn(1, nodes).astype(self.__dtype)
         self.__b2 = 0
         self.__A2 = 0
     
@@ -66,6 +72,11 @@ class NeuralNetwork:
         """Return the activated output for the output neuron."""
         return self.__A2
     
+    @property
+    def dtype(self):
+        """Return the floating point type of the computations."""
+        return self.__dtype
+    
     def forward_prop(self, X):
         """
         Calculate the forward propagation of the neural network.
@@ -76,6 +87,7 @@ class NeuralNetwork:
         Returns:
             The private attributes __A1 and __A2, respectively
         """
+        X = X.astype(self.__dtype, copy=False)
         Z1 = np.matmul(self.__W1, X) + self.__b1
         self.__A1 = 1 / (1 + np.exp(-Z1))
         
@@ -96,6 +108,7 @@ class NeuralNetwork:
             The cost
         """
         m = Y.shape[1]
+        Y = Y.astype(self.__dtype, copy=False)
         cost = -np.sum(Y * np.log(A) + (1 - Y) * np.log(1.0000001 - A)) / m
         return cost
     
@@ -104,18 +117,34 @@ class NeuralNetwork:
         Evaluate the neural network's predictions.
         
         Args:
-            X: numpy.ndarray with shape (nx, m) containing input data
-            Y: numpy.ndarray with shape (1, m) containing correct labels
+            X: numpy.ndarray with shape (nx, m) containing input data,
+               or a data source yielding (X, Y) batches
+            Y: numpy.ndarray with shape (1, m) containing correct labels,
+               ignored when X is a data source
             
         Returns:
             The neuron's prediction and the cost of the network
         """
+        if not isinstance(X, np.ndarray):
+            predictions = []
+            cost = 0
+            m = 0
+            source = X.ordered() if hasattr(X, 'ordered') else X
+            for X_batch, Y_batch in source:
+                A1, A2 = self.forward_prop(X_batch)
+                n = Y_batch.shape[1]
+                cost += self.cost(Y_batch, A2) * n
+                m += n
+                predictions.append(np.where(A2 >= 0.5, 1, 0))
+            return np.concatenate(predictions, axis=1), cost / m
+        
         self.forward_prop(X)
         cost = self.cost(Y, self.__A2)
         prediction = np.where(self.__A2 >= 0.5, 1, 0)
         return prediction, cost
     
-    def gradient_descent(self, X, Y, A1, A2, alpha=0.05):
+    def gradient_descent(self, X, Y, A1, A2, alpha=0.05,
+                         optimizer=None):
         """
         Calculate one pass of gradient descent on the neural network.
         
@@ -125,8 +154,12 @@ class NeuralNetwork:
             A1: Output of the hidden layer
             A2: Predicted output
             alpha: Learning rate
+            optimizer: Optimizer applying the update in place, or None
+                       for plain gradient descent
         """
         m = Y.shape[1]
+        X = X.astype(self.__dtype, copy=False)
+        Y = Y.astype(self.__dtype, copy=False)
         
         dZ2 = A2 - Y
         dW2 = np.matmul(dZ2, A1.T) / m
@@ -137,24 +170,40 @@ class NeuralNetwork:
         dW1 = np.matmul(dZ1, X.T) / m
         db1 = np.sum(dZ1, axis=1, keepdims=True) / m
         
+        if optimizer is not None:
+            params = {'W1': self.__W1, 'b1': self.__b1,
+                      'W2': self.__W2, 'b2': self.__b2}
+            grads = {'W1': dW1, 'b1': db1, 'W2': dW2, 'b2': db2}
+            optimizer.update(params, grads, alpha)
+            self.__b2 = params['b2']
+            return
+        
         self.__W1 = self.__W1 - alpha * dW1
         self.__b1 = self.__b1 - alpha * db1
         self.__W2 = self.__W2 - alpha * dW2
         self.__b2 = self.__b2 - alpha * db2
     
     def train(self, X, Y, iterations=5000, alpha=0.05,
-              verbose=True, graph=True, step=100):
+              verbose=True, graph=True, step=100, optimizer=None):
         """
         Train the neural network with optional verbose output and graphing.
         
+        When X is a data source, each iteration is one epoch of gradient
+        descent over its batches, and the reported cost is the mean of
+        the batch costs seen during that epoch.
+        
         Args:
-            X: numpy.ndarray with shape (nx, m) containing input data
-            Y: numpy.ndarray with shape (1, m) containing correct labels
+            X: numpy.ndarray with shape (nx, m) containing input data,
+               or a data source yielding (X, Y) batches
+            Y: numpy.ndarray with shape (1, m) containing correct labels,
+               ignored when X is a data source
             iterations: Number of iterations to train over
             alpha: Learning rate
             verbose: Boolean to print information about training
             graph: Boolean to graph information about training
             step: Step interval for output
+            optimizer: Optimizer applying the updates in place, or None
+                       for plain gradient descent
             
         Returns:
             The evaluation of the training data after iterations
@@ -183,9 +232,17 @@ class NeuralNetwork:
         costs = []
         steps_list = []
         
+        streaming = not isinstance(X, np.ndarray)
+        
         for i in range(iterations + 1):
-            A1, A2 = self.forward_prop(X)
-            cost = self.cost(Y, A2)
+            if streaming:
+                if i < iterations:
+                    cost = self.__train_epoch(X, alpha, optimizer)
+                else:
+                    _, cost = self.evaluate(X, Y)
+            else:
+                A1, A2 = self.forward_prop(X)
+                cost = self.cost(Y, A2)
             
             if verbose and (i % step == 0 or i == iterations):
                 print(f"Cost after {i} iterations: {cost}")
@@ -194,8 +251,8 @@ class NeuralNetwork:
                 costs.append(cost)
                 steps_list.append(i)
             
-            if i < iterations:
-                self.gradient_descent(X, Y, A1, A2, alpha)
+            if i < iterations and not streaming:
+                self.gradient_descent(X, Y, A1, A2, alpha, optimizer)
         
         if graph:
             plt.figure()
@@ -205,4 +262,28 @@ class NeuralNetwork:
             plt.title('Training Cost')
             plt.show()
         
-        return self.evaluate(X, Y)
\ No newline at end of file
+        return self.evaluate(X, Y)
+    
+    def __train_epoch(self, source, alpha, optimizer):
+        """
+        Run one epoch of gradient descent over a data source.
+        
+        Args:
+            source: Data source yielding (X, Y) batches
+            alpha: Learning rate
+            optimizer: Optimizer applying the updates, or None
+            
+        Returns:
+            The mean cost of the batches seen during the epoch
+        """
+        cost = 0
+        m = 0
+        for X_batch, Y_batch in source:
+            A1, A2 = self.forward_prop(X_batch)
+            n = Y_batch.shape[1]
+            cost += self.cost(Y_batch, A2) * n
+            m += n
+            self.gradient_descent(X_batch, Y_batch, A1, A2, alpha,
+                                  optimizer)
+        
+        return cost / m
@@ -4,12 +4,20 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import pickle
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
 
 
 class DeepNeuralNetwork:
     """Deep neural network with multiclass & selectable activations."""
 
-    def __init__(self, nx, layers, activation='sig'):
+    def __init__(self, nx, layers, activation='sig', dtype='float64',
+                 compute_dtype=None):
         """
         Initialize the deep neural network.
 
@@ -17,9 +25,13 @@ class DeepNeuralNetwork:
             nx: Number of input features
             layers: List of nodes in each layer
             activation: Activation function ('sig'/'tanh')
+            dtype: Floating point type of the weights ('float32'/'float64')
+            compute_dtype: Floating point type of the activations and
+                           gradients, or None to use dtype
 
         Raises:
-            TypeError: If nx not int or layers not list
+            TypeError: If nx not int, layers not list, or dtype or
+                       compute_dtype not float32/float64
             ValueError: If nx < 1 or layers empty or invalid activation
         """
         if not isinstance(nx, int):
@@ -37,18 +49,45 @@ class DeepNeuralNetwork:
         if activation not in ['sig', 'tanh']:
             raise ValueError("activation must be 'sig' or 'tanh'")
 
+        if compute_dtype is None:
+            compute_dtype = dtype
+        if dtype not in ['float32', 'float64', np.float32, np.float64]:
+            raise TypeError("dtype must be float32 or float64")
+        if compute_dtype not in ['float32', 'float64',
+                                 np.float32, np.float64]:
+            raise TypeError("compute_dtype must be float32 or float64")
+
         self.__L = len(layers)
         self.__cache = {}
         self.__weights = {}
         self.__activation = activation
+        self.__dtype = np.dtype(dtype)
+        self.__compute_dtype = np.dtype(compute_dtype)
+        self.__workspaces = {}
 
         prev_nodes = nx
         for i in range(1, self.__L + 1):
             w = np.random.randn(layers[i-1], prev_nodes)
-            self.__weights[f'W{i}'] = w * np.sqrt(2.0 / prev_nodes)
-            self.__weights[f'b{i}'] = np.zeros((layers[i-1], 1))
+            w = w * np.sqrt(2.0 / prev_nodes)
+            self.__weights[f'W{i}'] = w.astype(self.__dtype)
+            self.__weights[f'b{i}'] = np.zeros((layers[i-1], 1),
+                                               dtype=self.__dtype)
             prev_nodes = layers[i-1]
 
+    def __getstate__(self):
+        """Return the attributes to pickle, without training buffers."""
+        state = self.__dict__.copy()
+        state['_DeepNeuralNetwork__workspaces'] = {}
+        return state
+
+    def __setstate__(self, state):
+        """Restore pickled attributes, defaulting ones added later."""
+        dtype = state['_DeepNeuralNetwork__weights']['W1'].dtype
+        state.setdefault('_DeepNeuralNetwork__dtype', dtype)
+        state.setdefault('_DeepNeuralNetwork__compute_dtype', dtype)
+        state.setdefault('_DeepNeuralNetwork__workspaces', {})
+        self.__dict__.update(state)
+
     @property
     def L(self):
         """Return the number of layers."""
@@ -69,66 +108,156 @@ class DeepNeuralNetwork:
         """Return the activation function."""
         return self.__activation
 
-    def forward_prop(self, X):
+    @property
+    def dtype(self):
+        """Return the floating point type of the weights."""
+        return self.__dtype
+
+    @property
+    def compute_dtype(self):
+        """Return the floating point type of the computations."""
+        return self.__compute_dtype
+
+    def __compute_weights(self, i):
+        """
+        Return the weights of a layer in the compute dtype.
+
+        Args:
+            i: Index of the layer
+
+        Returns:
+            The weights and bias of layer i, copied only if the weights
+            are stored in a different dtype
+        """
+        c = self.__compute_dtype
+        return (self.__weights[f'W{i}'].astype(c, copy=False),
+                self.__weights[f'b{i}'].astype(c, copy=False))
+
+    def forward_prop(self, X, workspace=False):
         """
         Calculate the forward propagation of the neural network.
 
         Args:
             X: numpy.ndarray with shape (nx, m) containing input data
+            workspace: Boolean to write the activations into buffers
+                       preallocated for m examples; the returned arrays
+                       are then overwritten by the next call
 
         Returns:
             The output of the neural network and the cache
         """
-        self.__cache['A0'] = X
+        if workspace:
+            return self.__forward_prop_inplace(X, self.__workspace(X),
+                                               self.__cache)
+
+        return self.__forward(X, self.__cache), self.__cache
+
+    def __forward(self, X, cache):
+        """
+        Calculate the forward propagation into a given cache.
+
+        Args:
+            X: numpy.ndarray with shape (nx, m) containing input data
+            cache: Dictionary receiving the activations of every layer
+
+        Returns:
+            The output of the neural network
+        """
+        X = X.astype(self.__compute_dtype, copy=False)
+        cache['A0'] = X
         A = X
 
         for i in range(1, self.__L + 1):
-            Z = np.matmul(self.__weights[f'W{i}'], A) + self.__weights[f'b{i}']
+            W, b = self.__compute_weights(i)
+            Z = np.matmul(W, A) + b
             if i == self.__L:
                 # Use softmax for output layer in multiclass
-                A = np.exp(Z) / np.sum(np.exp(Z), axis=0, keepdims=True)
+                A = np.exp(Z)
+                A /= np.sum(A, axis=0, keepdims=True)
             else:
                 # Use selected activation for hidden layers
                 if self.__activation == 'sig':
                     A = 1 / (1 + np.exp(-Z))
                 else:  # tanh
                     A = np.tanh(Z)
-            self.__cache[f'A{i}'] = A
+            cache[f'A{i}'] = A
 
-        return A, self.__cache
+        return A
 
-    def cost(self, Y, A):
+    def cost(self, Y, A, workspace=False):
         """
         Calculate the cost of the model using cross-entropy loss.
 
         Args:
             Y: numpy.ndarray with shape (classes, m) correct labels
             A: numpy.ndarray with shape (classes, m) activated output
+            workspace: Boolean to compute the cost in a buffer
+                       preallocated for m examples
 
         Returns:
             The cost
         """
         m = Y.shape[1]
+        if workspace:
+            return self.__cost_inplace(Y, A, self.__workspace(Y)) / m
+        Y = Y.astype(self.__compute_dtype, copy=False)
         cost = -np.sum(Y * np.log(A + 1e-10)) / m
         return cost
 
-    def evaluate(self, X, Y):
+    @staticmethod
+    def __cost_inplace(Y, A, ws):
         """
-        Evaluate the neural network's predictions.
+        Calculate the cross-entropy summed over the examples in a buffer.
 
         Args:
-            X: numpy.ndarray with shape (nx, m) containing input data
             Y: numpy.ndarray with shape (classes, m) correct labels
+            A: numpy.ndarray with shape (classes, m) activated output
+            ws: Dictionary of buffers preallocated for m examples
 
         Returns:
-            The neuron's prediction and the cost of the network
+            The cost summed over the m examples
         """
-        A, _ = self.forward_prop(X)
-        cost = self.cost(Y, A)
-        prediction = np.eye(Y.shape[0])[np.argmax(A, axis=0)].T
-        return prediction, cost
+        C = ws['C']
+        np.add(A, 1e-10, out=C)
+        np.log(C, out=C)
+        C *= Y
+        return -np.sum(C)
 
-    def gradient_descent(self, Y, cache, alpha=0.05):
+    def evaluate(self, X, Y, batch_size=None):
+        """
+        Evaluate the neural network's predictions.
+
+        Args:
+            X: numpy.ndarray with shape (nx, m) containing input data,
+               or a data source yielding (X, Y) batches
+            Y: numpy.ndarray with shape (classes, m) correct labels,
+               ignored when X is a data source
+            batch_size: Number of examples per forward pass, or None
+                        to evaluate all m examples at once
+
+        Returns:
+            The neuron's prediction and the cost of the network
+        """
+        if isinstance(X, np.ndarray) and batch_size is None:
+            A, _ = self.forward_prop(X)
+            cost = self.cost(Y, A)
+            prediction = np.eye(Y.shape[0])[np.argmax(A, axis=0)].T
+            return prediction, cost
+
+        predictions = []
+        cost = 0
+        m = 0
+        for X_batch, Y_batch in self.__batches(X, Y, batch_size, False):
+            A, _ = self.forward_prop(X_batch)
+            n = Y_batch.shape[1]
+            cost += self.cost(Y_batch, A) * n
+            m += n
+            predictions.append(
+                np.eye(Y_batch.shape[0])[np.argmax(A, axis=0)].T)
+        return np.concatenate(predictions, axis=1), cost / m
+
+    def gradient_descent(self, Y, cache, alpha=0.05, optimizer=None,
+                         workspace=False):
         """
         Calculate one pass of gradient descent on the neural network.
 
@@ -136,47 +265,127 @@ class DeepNeuralNetwork:
             Y: numpy.ndarray containing correct labels
             cache: Dictionary containing all the intermediary values
             alpha: Learning rate
+            optimizer: Optimizer applying the update in place, or None
+                       for plain gradient descent
+            workspace: Boolean to compute the gradients in buffers
+                       preallocated for m examples and update the
+                       weights in place
         """
-        m = Y.shape[1]
+        if workspace:
+            self.__gradient_descent_inplace(Y, cache, alpha, optimizer,
+                                            self.__workspace(Y))
+            return
+
+        grads = self.__gradients(Y, cache, Y.shape[1])
+        self.__update(grads, alpha, optimizer)
+
+    def __gradients(self, Y, cache, m):
+        """
+        Calculate the gradients of the cost for every layer.
+
+        Args:
+            Y: numpy.ndarray containing correct labels
+            cache: Dictionary containing all the intermediary values
+            m: Number of examples the gradients are averaged over
+
+        Returns:
+            Dictionary mapping the names of the weights to their gradients
+        """
+        Y = Y.astype(self.__compute_dtype, copy=False)
         dZ = cache[f'A{self.__L}'] - Y
+        grads = {}
 
         for i in range(self.__L, 0, -1):
             A_prev = cache[f'A{i-1}']
-            dW = np.matmul(dZ, A_prev.T) / m
-            db = np.sum(dZ, axis=1, keepdims=True) / m
+            grads[f'W{i}'] = np.matmul(dZ, A_prev.T) / m
+            grads[f'b{i}'] = np.sum(dZ, axis=1, keepdims=True) / m
 
             if i > 1:
-                dA = np.matmul(self.__weights[f'W{i}'].T, dZ)
+                W, _ = self.__compute_weights(i)
+                dA = np.matmul(W.T, dZ)
                 if self.__activation == 'sig':
                     dZ = dA * A_prev * (1 - A_prev)
                 else:  # tanh
                     dZ = dA * (1 - A_prev**2)
 
-            self.__weights[f'W{i}'] = self.__weights[f'W{i}'] - alpha * dW
-            self.__weights[f'b{i}'] = self.__weights[f'b{i}'] - alpha * db
+        return grads
+
+    def __update(self, grads, alpha, optimizer):
+        """
+        Update the weights from their gradients.
+
+        The weights are updated in place, so they keep their dtype when
+        the gradients are in a wider compute dtype.
+
+        Args:
+            grads: Dictionary mapping the names of the weights to their
+                   gradients
+            alpha: Learning rate
+            optimizer: Optimizer applying the update in place, or None
+                       for plain gradient descent
+        """
+        if optimizer is not None:
+            optimizer.update(self.__weights, grads, alpha)
+            return
+
+        for key, grad in grads.items():
+            W = self.__weights[key]
+            np.subtract(W, alpha * grad, out=W, casting='same_kind')
 
     def train(self, X, Y, iterations=5000, alpha=0.05,
-              verbose=True, graph=True, step=100):
+              verbose=True, graph=True, step=100,
+              batch_size=None, shuffle=True, optimizer=None,
+              workspace=False, workers=None):
         """
         Train the deep neural network with optional output and graph.
 
+        When batch_size is given or X is a data source, each iteration
+        is one epoch over the data in mini-batches, and the reported cost
+        is the mean of the batch costs seen during that epoch.
+
+        When workers is greater than 1, every batch is split column-wise
+        across a pool of threads. Each thread runs the forward and
+        backward pass on its shard into buffers of its own, the shard
+        gradients are summed in place, and a single update is applied.
+        NumPy releases the GIL inside matmul, so the shards run
+        concurrently. To avoid oversubscribing the cores, BLAS is
+        limited to one thread during training when threadpoolctl is
+        installed; without it, set OMP_NUM_THREADS=1 (or the variable
+        of your BLAS) before starting Python.
+
         Args:
-            X: numpy.ndarray with shape (nx, m) containing input data
-            Y: numpy.ndarray containing correct labels
-            iterations: Number of iterations to train over
+            X: numpy.ndarray with shape (nx, m) containing input data,
+               or a data source yielding (X, Y) batches
+            Y: numpy.ndarray containing correct labels, ignored when X
+               is a data source
+            iterations: Number of iterations (or epochs) to train over
             alpha: Learning rate
             verbose: Boolean to print information about training
             graph: Boolean to graph information about training
             step: Step interval for output
+            batch_size: Number of examples per mini-batch, or None for
+                        full-batch gradient descent; ignored when X is
+                        a data source
+            shuffle: Boolean to reshuffle the examples every epoch;
+                     ignored when X is a data source
+            optimizer: Optimizer applying the updates in place, or None
+                       for plain gradient descent
+            workspace: Boolean to reuse per-layer buffers preallocated
+                       for each batch shape instead of allocating new
+                       arrays on every iteration; always done when
+                       workers is greater than 1
+            workers: Number of threads sharing each batch, or None
 
         Returns:
             The evaluation of the training data after iterations
 
         Raises:
             TypeError: If iterations not int, alpha not float,
-                       or step not integer
-            ValueError: If iterations or alpha not positive, or step
-                        not positive or greater than iterations
+                       step not integer, or batch_size or workers not
+                       integer
+            ValueError: If iterations or alpha not positive, step
+                        not positive or greater than iterations, or
+                        batch_size or workers not positive
         """
         if not isinstance(iterations, int):
             raise TypeError("iterations must be an integer")
@@ -193,22 +402,50 @@ class DeepNeuralNetwork:
             if step < 1 or step > iterations:
                 raise ValueError("step must be positive and <= iterations")
 
+        if batch_size is not None:
+            if not isinstance(batch_size, int):
+                raise TypeError("batch_size must be an integer")
+            if batch_size < 1:
+                raise ValueError("batch_size must be a positive integer")
+
+        if workers is not None:
+            if not isinstance(workers, int):
+                raise TypeError("workers must be an integer")
+            if workers < 1:
+                raise ValueError("workers must be a positive integer")
+
+        parallel = workers is not None and workers > 1
+        batched = batch_size is not None or not isinstance(X, np.ndarray)
+        batched = batched or parallel
         costs = []
         steps_list = []
 
-        for i in range(iterations + 1):
-            A, cache = self.forward_prop(X)
-            cost = self.cost(Y, A)
-
-            if verbose and (i % step == 0 or i == iterations):
-                print(f"Cost after {i} iterations: {cost}")
-
-            if graph and (i % step == 0 or i == iterations):
-                costs.append(cost)
-                steps_list.append(i)
-
-            if i < iterations:
-                self.gradient_descent(Y, cache, alpha)
+        limit = parallel and threadpool_limits is not None
+        with (ThreadPoolExecutor(workers) if parallel
+              else nullcontext()) as pool, \
+                (threadpool_limits(1) if limit else nullcontext()):
+            for i in range(iterations + 1):
+                if batched:
+                    if i < iterations:
+                        batches = self.__batches(X, Y, batch_size, shuffle)
+                        cost = self.__train_epoch(batches, alpha, optimizer,
+                                                  workspace, pool, workers)
+                    else:
+                        _, cost = self.evaluate(X, Y, batch_size)
+                else:
+                    A, cache = self.forward_prop(X, workspace)
+                    cost = self.cost(Y, A, workspace)
+
+                if verbose and (i % step == 0 or i == iterations):
+                    print(f"Cost after {i} iterations: {cost}")
+
+                if graph and (i % step == 0 or i == iterations):
+                    costs.append(cost)
+                    steps_list.append(i)
+
+                if i < iterations and not batched:
+                    self.gradient_descent(Y, cache, alpha, optimizer,
+                                          workspace)
 
         if graph:
             plt.figure()
@@ -218,7 +455,297 @@ class DeepNeuralNetwork:
             plt.title('Training Cost')
             plt.show()
 
-        return self.evaluate(X, Y)
+        self.__workspaces = {}
+        return self.evaluate(X, Y, batch_size)
+
+    @staticmethod
+    def __batches(X, Y, batch_size, shuffle):
+        """
+        Split the training data into mini-batches.
+
+        Args:
+            X: numpy.ndarray with shape (nx, m) containing input data,
+               or a data source yielding (X, Y) batches
+            Y: numpy.ndarray containing correct labels
+            batch_size: Number of examples per mini-batch, or None for
+                        a single batch holding all the examples
+            shuffle: Boolean to visit the examples in random order; when
+                     False a data source is read in file order
+
+        Yields:
+            The (X, Y) mini-batches of one epoch
+        """
+        if not isinstance(X, np.ndarray):
+            if not shuffle and hasattr(X, 'ordered'):
+                X = X.ordered()
+            yield from X
+            return
+        if batch_size is None:
+            yield X, Y
+            return
+
+        m = Y.shape[1]
+        if shuffle:
+            order = np.random.permutation(m)
+        for start in range(0, m, batch_size):
+            if shuffle:
+                batch = order[start:start + batch_size]
+            else:
+                batch = slice(start, start + batch_size)
+            yield X[:, batch], Y[:, batch]
+
+    def __train_epoch(self, batches, alpha, optimizer, workspace,
+                      pool=None, workers=None):
+        """
+        Run one epoch of mini-batch gradient descent.
+
+        Args:
+            batches: Iterable of (X, Y) mini-batches
+            alpha: Learning rate
+            optimizer: Optimizer applying the updates, or None
+            workspace: Boolean to reuse preallocated per-layer buffers
+            pool: Thread pool sharing each mini-batch, or None
+            workers: Number of threads in the pool
+
+        Returns:
+            The mean cost of the mini-batches seen during the epoch
+        """
+        cost = 0
+        m = 0
+        for X_batch, Y_batch in batches:
+            n = Y_batch.shape[1]
+            m += n
+            if pool is not None:
+                cost += self.__parallel_step(X_batch, Y_batch, alpha,
+                                             optimizer, pool, workers) * n
+                continue
+            A, cache = self.forward_prop(X_batch, workspace)
+            cost += self.cost(Y_batch, A, workspace) * n
+            self.gradient_descent(Y_batch, cache, alpha, optimizer,
+                                  workspace)
+
+        return cost / m
+
+    def __parallel_step(self, X, Y, alpha, optimizer, pool, workers):
+        """
+        Run one step of gradient descent with the batch split in shards.
+
+        Args:
+            X: numpy.ndarray with shape (nx, m) containing input data
+            Y: numpy.ndarray containing correct labels
+            alpha: Learning rate
+            optimizer: Optimizer applying the update, or None
+            pool: Thread pool computing the shard gradients
+            workers: Number of threads in the pool
+
+        Returns:
+            The cost of the batch before the update
+        """
+        m = Y.shape[1]
+        bounds = np.linspace(0, m, min(workers, m) + 1).astype(int)
+        shards = [slice(bounds[k], bounds[k + 1])
+                  for k in range(len(bounds) - 1)]
+        wss = [self.__workspace(Y[:, s], k) for k, s in enumerate(shards)]
+        costs = list(pool.map(
+            lambda k: self.__shard_gradients(X[:, shards[k]],
+                                             Y[:, shards[k]], m, wss[k]),
+            range(len(shards))))
+
+        def reduce(key):
+            for ws in wss[1:]:
+                wss[0][key] += ws[key]
+
+        list(pool.map(reduce, [f'd{p}{i}' for i in range(1, self.__L + 1)
+                               for p in 'Wb']))
+        self.__update_inplace(wss[0], alpha, optimizer)
+
+        return sum(costs) / m
+
+    def __shard_gradients(self, X, Y, m, ws):
+        """
+        Calculate the summed cost and the gradients for one shard.
+
+        Args:
+            X: numpy.ndarray with shape (nx, n) holding the shard inputs
+            Y: numpy.ndarray with shape (classes, n) holding its labels
+            m: Number of examples in the whole batch
+            ws: Dictionary of buffers preallocated for the n examples,
+                receiving the contribution of the shard to the batch
+                gradients
+
+        Returns:
+            The cost summed over the shard
+        """
+        cache = ws.setdefault('cache', {})
+        A, _ = self.__forward_prop_inplace(X, ws, cache)
+        self.__gradients_inplace(Y, cache, m, ws)
+        return self.__cost_inplace(Y, A, ws)
+
+    def __workspace(self, X, shard=None):
+        """
+        Return the buffers preallocated for the batch size of X.
+
+        The buffers are allocated the first time a batch size is seen
+        and reused until training finishes.
+
+        Args:
+            X: numpy.ndarray with shape (n, m) for the batch
+            shard: Index of the worker thread using the buffers, or None
+                   for the buffers of the main thread
+
+        Returns:
+            Dictionary of preallocated numpy.ndarrays
+        """
+        m = X.shape[1]
+        key = m if shard is None else (shard, m)
+        ws = self.__workspaces.get(key)
+        if ws is not None:
+            return ws
+
+        c = self.__compute_dtype
+        ws = {}
+        for i in range(1, self.__L + 1):
+            W = self.__weights[f'W{i}']
+            ws[f'A{i}'] = np.empty((W.shape[0], m), dtype=c)
+            ws[f'dZ{i}'] = np.empty((W.shape[0], m), dtype=c)
+            ws[f'T{i}'] = np.empty((W.shape[0], m), dtype=c)
+            ws[f'dW{i}'] = np.empty(W.shape, dtype=c)
+            ws[f'db{i}'] = np.empty((W.shape[0], 1), dtype=c)
+            if self.__dtype != c:
+                ws[f'W{i}'] = np.empty(W.shape, dtype=c)
+                ws[f'b{i}'] = np.empty((W.shape[0], 1), dtype=c)
+        ws['S'] = np.empty((1, m), dtype=c)
+        ws['C'] = np.empty((W.shape[0], m), dtype=c)
+        self.__workspaces[key] = ws
+        return ws
+
+    def __forward_prop_inplace(self, X, ws, cache):
+        """
+        Calculate the forward propagation into preallocated buffers.
+
+        When the weights are stored in a different dtype than the one
+        used for computing, they are copied into compute-dtype buffers
+        that the backward pass reuses.
+
+        Args:
+            X: numpy.ndarray with shape (nx, m) containing input data
+            ws: Dictionary of buffers preallocated for m examples
+            cache: Dictionary receiving the activations of every layer
+
+        Returns:
+            The output of the neural network and the cache
+        """
+        if X.dtype != self.__compute_dtype:
+            if 'A0' not in ws:
+                ws['A0'] = np.empty(X.shape, dtype=self.__compute_dtype)
+            np.copyto(ws['A0'], X)
+            X = ws['A0']
+        cache['A0'] = X
+        A = X
+
+        for i in range(1, self.__L + 1):
+            W = self.__weights[f'W{i}']
+            b = self.__weights[f'b{i}']
+            if self.__dtype != self.__compute_dtype:
+                np.copyto(ws[f'W{i}'], W)
+                np.copyto(ws[f'b{i}'], b)
+                W = ws[f'W{i}']
+                b = ws[f'b{i}']
+            Z = ws[f'A{i}']
+            np.matmul(W, A, out=Z)
+            Z += b
+            if i == self.__L:
+                np.exp(Z, out=Z)
+                np.sum(Z, axis=0, keepdims=True, out=ws['S'])
+                Z /= ws['S']
+            elif self.__activation == 'sig':
+                np.negative(Z, out=Z)
+                np.exp(Z, out=Z)
+                Z += 1
+                np.reciprocal(Z, out=Z)
+            else:  # tanh
+                np.tanh(Z, out=Z)
+            A = Z
+            cache[f'A{i}'] = A
+
+        return A, cache
+
+    def __gradient_descent_inplace(self, Y, cache, alpha, optimizer, ws):
+        """
+        Calculate one pass of gradient descent using preallocated buffers.
+
+        Args:
+            Y: numpy.ndarray containing correct labels
+            cache: Dictionary containing all the intermediary values
+            alpha: Learning rate
+            optimizer: Optimizer applying the update in place, or None
+            ws: Dictionary of buffers preallocated for m examples
+        """
+        self.__gradients_inplace(Y, cache, Y.shape[1], ws)
+        self.__update_inplace(ws, alpha, optimizer)
+
+    def __gradients_inplace(self, Y, cache, m, ws):
+        """
+        Calculate the gradients of the cost into preallocated buffers.
+
+        Args:
+            Y: numpy.ndarray containing correct labels
+            cache: Dictionary containing all the intermediary values
+            m: Number of examples the gradients are averaged over
+            ws: Dictionary of buffers preallocated for the examples of Y,
+                receiving the gradients in dW1, db1, ...
+        """
+        dZ = ws[f'dZ{self.__L}']
+        np.subtract(cache[f'A{self.__L}'], Y, out=dZ)
+
+        for i in range(self.__L, 0, -1):
+            A_prev = cache[f'A{i-1}']
+            dW = ws[f'dW{i}']
+            db = ws[f'db{i}']
+            np.matmul(dZ, A_prev.T, out=dW)
+            dW /= m
+            np.sum(dZ, axis=1, keepdims=True, out=db)
+            db /= m
+
+            if i > 1:
+                dA = ws[f'dZ{i-1}']
+                T = ws[f'T{i-1}']
+                W = ws.get(f'W{i}', self.__weights[f'W{i}'])
+                np.matmul(W.T, dZ, out=dA)
+                if self.__activation == 'sig':
+                    np.subtract(1, A_prev, out=T)
+                    T *= A_prev
+                else:  # tanh
+                    np.multiply(A_prev, A_prev, out=T)
+                    np.subtract(1, T, out=T)
+                dA *= T
+                dZ = dA
+
+    def __update_inplace(self, ws, alpha, optimizer):
+        """
+        Update the weights from the gradients held in a workspace.
+
+        Without an optimizer the gradient buffers are scaled by alpha in
+        place, so no temporary array is allocated.
+
+        Args:
+            ws: Dictionary of buffers holding the gradients in dW1, db1, ...
+            alpha: Learning rate
+            optimizer: Optimizer applying the update in place, or None
+        """
+        if optimizer is not None:
+            grads = {}
+            for i in range(1, self.__L + 1):
+                grads[f'W{i}'] = ws[f'dW{i}']
+                grads[f'b{i}'] = ws[f'db{i}']
+            optimizer.update(self.__weights, grads, alpha)
+            return
+
+        for i in range(1, self.__L + 1):
+            for p in 'Wb':
+                grad = ws[f'd{p}{i}']
+                grad *= alpha
+                self.__weights[f'{p}{i}'] -= grad
 
     def save(self, filename):
         """
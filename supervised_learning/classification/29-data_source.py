@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Defines a streaming data source over memory-mapped .npy shards."""
+
+import os
+import queue
+import threading
+import numpy as np
+
+
+class DataSource:
+    """Iterates over (X, Y) column chunks read from .npy shards."""
+
+    def __init__(self, X, Y, batch_size=1024, shuffle=False, prefetch=2):
+        """
+        Initialize the data source.
+
+        X and Y may each be a path to a .npy file, a directory of .npy
+        shards (read in sorted filename order) or a list of paths. The
+        shards are opened with mmap_mode='r', so nothing is read until a
+        chunk is requested. The i-th X shard with shape (nx, m_i) must
+        line up with the i-th Y shard with shape (classes, m_i).
+
+        Args:
+            X: Location of the input data shards
+            Y: Location of the label shards
+            batch_size: Maximum number of examples in each chunk
+            shuffle: Boolean to visit shards and chunks in random order
+                     when iterating (ordered() always reads in file order)
+            prefetch: Number of chunks read ahead by the loader thread
+
+        Raises:
+            TypeError: If batch_size or prefetch is not an integer
+            ValueError: If batch_size or prefetch is less than 1, or the
+                        X and Y shards do not line up
+        """
+        if not isinstance(batch_size, int):
+            raise TypeError("batch_size must be an integer")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if not isinstance(prefetch, int):
+            raise TypeError("prefetch must be an integer")
+        if prefetch < 1:
+            raise ValueError("prefetch must be a positive integer")
+
+        self.__X = [np.load(f, mmap_mode='r') for f in self.__files(X)]
+        self.__Y = [np.load(f, mmap_mode='r') for f in self.__files(Y)]
+        if len(self.__X) == 0 or len(self.__X) != len(self.__Y):
+            raise ValueError("X and Y must have the same number of shards")
+        for X_shard, Y_shard in zip(self.__X, self.__Y):
+            if X_shard.ndim != 2 or Y_shard.ndim != 2:
+                raise ValueError("shards must be 2D arrays")
+            if X_shard.shape[1] != Y_shard.shape[1]:
+                raise ValueError("X and Y shards must have the same m")
+
+        self.__batch_size = batch_size
+        self.__shuffle = shuffle
+        self.__prefetch = prefetch
+
+    @staticmethod
+    def __files(path):
+        """
+        Resolve a shard location into a list of .npy file paths.
+
+        Args:
+            path: File path, directory path or list of file paths
+
+        Returns:
+            The list of shard file paths
+        """
+        if isinstance(path, (list, tuple)):
+            return list(path)
+        if os.path.isdir(path):
+            return [os.path.join(path, f) for f in sorted(os.listdir(path))
+                    if f.endswith('.npy')]
+        return [path]
+
+    @property
+    def batch_size(self):
+        """Return the maximum number of examples in each chunk."""
+        return self.__batch_size
+
+    @property
+    def nx(self):
+        """Return the number of input features."""
+        return self.__X[0].shape[0]
+
+    @property
+    def m(self):
+        """Return the total number of examples across all shards."""
+        return sum(X_shard.shape[1] for X_shard in self.__X)
+
+    def __chunks(self, shuffle):
+        """
+        List the (shard, start) pairs making up one pass over the data.
+
+        Args:
+            shuffle: Boolean to put shards and chunks in random order
+
+        Returns:
+            The list of chunk locations in the order they will be read
+        """
+        shards = list(range(len(self.__X)))
+        if shuffle:
+            np.random.shuffle(shards)
+
+        chunks = []
+        for s in shards:
+            starts = list(range(0, self.__X[s].shape[1], self.__batch_size))
+            if shuffle:
+                np.random.shuffle(starts)
+            chunks.extend((s, start) for start in starts)
+        return chunks
+
+    def __load(self, chunks, out, stop):
+        """
+        Read chunks into memory and hand them to the consumer.
+
+        Args:
+            chunks: List of (shard, start) chunk locations
+            out: Queue receiving (X, Y) chunks, an exception or None
+            stop: Event set by the consumer when it stops iterating
+        """
+        try:
+            for s, start in chunks:
+                batch = slice(start, start + self.__batch_size)
+                item = (np.array(self.__X[s][:, batch]),
+                        np.array(self.__Y[s][:, batch]))
+                while not stop.is_set():
+                    try:
+                        out.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stop.is_set():
+                    return
+            item = None
+        except Exception as e:
+            item = e
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def __iter__(self):
+        """
+        Yield the (X, Y) chunks of one pass over the data.
+
+        The chunks are in random order if the source was created with
+        shuffle=True, as is wanted for training epochs.
+
+        Yields:
+            numpy.ndarray X with shape (nx, n) and Y with shape (classes, n)
+        """
+        return self.__read(self.__chunks(self.__shuffle))
+
+    def ordered(self):
+        """
+        Yield the (X, Y) chunks of one pass over the data in file order.
+
+        Used for evaluation, so that the predictions line up with the
+        labels as stored whether or not the source shuffles.
+
+        Yields:
+            numpy.ndarray X with shape (nx, n) and Y with shape (classes, n)
+        """
+        return self.__read(self.__chunks(False))
+
+    def __read(self, chunks):
+        """
+        Yield the (X, Y) chunks at the given locations.
+
+        Chunks are read by a background thread so that disk I/O overlaps
+        with the computation done on the previous chunk.
+
+        Args:
+            chunks: List of (shard, start) chunk locations
+
+        Yields:
+            numpy.ndarray X with shape (nx, n) and Y with shape (classes, n)
+        """
+        out = queue.Queue(maxsize=self.__prefetch)
+        stop = threading.Event()
+        loader = threading.Thread(target=self.__load,
+                                  args=(chunks, out, stop))
+        loader.daemon = True
+        loader.start()
+        try:
+            while True:
+                item = out.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            loader.join()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Defines optimizers that update model parameters in place."""
+
+import numpy as np
+
+
+class GradientDescent:
+    """Plain gradient descent: W = W - alpha * dW."""
+
+    def __init__(self):
+        """Initialize the optimizer with empty state buffers."""
+        self.__t = 0
+        self.__state = {}
+
+    @property
+    def t(self):
+        """Return the number of updates applied so far."""
+        return self.__t
+
+    def buffers(self, key, param, count):
+        """
+        Return the state buffers kept for a parameter.
+
+        The buffers are allocated with the parameter's shape and dtype on
+        first use and reused on every later update.
+
+        Args:
+            key: Name of the parameter
+            param: numpy.ndarray holding the parameter
+            count: Number of buffers needed
+
+        Returns:
+            A list of count numpy.ndarrays
+        """
+        state = self.__state.get(key)
+        if state is None or state[0].shape != param.shape:
+            state = [np.zeros_like(param) for _ in range(count)]
+            self.__state[key] = state
+        return state
+
+    def update(self, params, grads, alpha):
+        """
+        Apply one update to every parameter that has a gradient.
+
+        numpy.ndarray parameters are modified in place. Scalar parameters
+        (such as the bias of a Neuron) are replaced in params by a value
+        with the shape of their gradient.
+
+        Args:
+            params: Dictionary mapping names to parameters
+            grads: Dictionary mapping the same names to gradients
+            alpha: Learning rate
+        """
+        self.__t += 1
+        for key, grad in grads.items():
+            param = params[key]
+            if isinstance(param, np.ndarray):
+                self.step(key, param, grad, alpha)
+            else:
+                dtype = np.result_type(grad, 0.0)
+                value = np.full(np.shape(grad), param, dtype=dtype)
+                self.step(key, value, grad, alpha)
+                params[key] = value if value.ndim else float(value)
+
+    def step(self, key, param, grad, alpha):
+        """
+        Update a single parameter in place.
+
+        Args:
+            key: Name of the parameter
+            param: numpy.ndarray holding the parameter
+            grad: Gradient of the cost with respect to param
+            alpha: Learning rate
+        """
+        tmp, = self.buffers(key, param, 1)
+        np.multiply(grad, alpha, out=tmp)
+        param -= tmp
+
+
+class Momentum(GradientDescent):
+    """Gradient descent with momentum."""
+
+    def __init__(self, beta1=0.9):
+        """
+        Initialize the optimizer.
+
+        Args:
+            beta1: Momentum weight
+        """
+        super().__init__()
+        self.__beta1 = beta1
+
+    @property
+    def beta1(self):
+        """Return the momentum weight."""
+        return self.__beta1
+
+    def step(self, key, param, grad, alpha):
+        """
+        Update a single parameter in place.
+
+        Args:
+            key: Name of the parameter
+            param: numpy.ndarray holding the parameter
+            grad: Gradient of the cost with respect to param
+            alpha: Learning rate
+        """
+        v, tmp = self.buffers(key, param, 2)
+        v *= self.__beta1
+        np.multiply(grad, 1 - self.__beta1, out=tmp)
+        v += tmp
+        np.multiply(v, alpha, out=tmp)
+        param -= tmp
+
+
+class RMSProp(GradientDescent):
+    """RMSProp optimization."""
+
+    def __init__(self, beta2=0.9, epsilon=1e-8):
+        """
+        Initialize the optimizer.
+
+        Args:
+            beta2: RMSProp weight
+            epsilon: Small number to avoid division by zero
+        """
+        super().__init__()
+        self.__beta2 = beta2
+        self.__epsilon = epsilon
+
+    @property
+    def beta2(self):
+        """Return the RMSProp weight."""
+        return self.__beta2
+
+    @property
+    def epsilon(self):
+        """Return the epsilon."""
+        return self.__epsilon
+
+    def step(self, key, param, grad, alpha):
+        """
+        Update a single parameter in place.
+
+        Args:
+            key: Name of the parameter
+            param: numpy.ndarray holding the parameter
+            grad: Gradient of the cost with respect to param
+            alpha: Learning rate
+        """
+        s, tmp = self.buffers(key, param, 2)
+        s *= self.__beta2
+        np.multiply(grad, grad, out=tmp)
+        tmp *= 1 - self.__beta2
+        s += tmp
+        np.sqrt(s, out=tmp)
+        tmp += self.__epsilon
+        np.divide(grad, tmp, out=tmp)
+        tmp *= alpha
+        param -= tmp
+
+
+class Adam(GradientDescent):
+    """Adam optimization with bias correction."""
+
+    def __init__(self, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        """
+        Initialize the optimizer.
+
+        Args:
+            beta1: Weight of the first moment
+            beta2: Weight of the second moment
+            epsilon: Small number to avoid division by zero
+        """
+        super().__init__()
+        self.__beta1 = beta1
+        self.__beta2 = beta2
+        self.__epsilon = epsilon
+
+    @property
+    def beta1(self):
+        """Return the weight of the first moment."""
+        return self.__beta1
+
+    @property
+    def beta2(self):
+        """Return the weight of the second moment."""
+        return self.__beta2
+
+    @property
+    def epsilon(self):
+        """Return the epsilon."""
+        return self.__epsilon
+
+    def step(self, key, param, grad, alpha):
+        """
+        Update a single parameter in place.
+
+        Args:
+            key: Name of the parameter
+            param: numpy.ndarray holding the parameter
+            grad: Gradient of the cost with respect to param
+            alpha: Learning rate
+        """
+        v, s, tmp = self.buffers(key, param, 3)
+        v *= self.__beta1
+        np.multiply(grad, 1 - self.__beta1, out=tmp)
+        v += tmp
+        s *= self.__beta2
+        np.multiply(grad, grad, out=tmp)
+        tmp *= 1 - self.__beta2
+        s += tmp
+
+        np.divide(s, 1 - self.__beta2 ** self.t, out=tmp)
+        np.sqrt(tmp, out=tmp)
+        tmp += self.__epsilon
+        np.divide(v, tmp, out=tmp)
+        tmp *= alpha / (1 - self.__beta1 ** self.t)
+        param -= tmp
@@ -8,23 +8,29 @@ import matplotlib.pyplot as plt
 class Neuron:
     """A single neuron performing binary classification."""
 
-    def __init__(self, nx):
+    def __init__(self, nx, dtype='float64'):
         """
         Initialize the neuron.
         
         Args:
             nx: Number of input features to the neuron
+            dtype: Floating point type of the weights and activations
+                   ('float32'/'float64')
             
         Raises:
-            TypeError: If nx is not an integer
+            TypeError: If nx is not an integer or dtype is not
+                       float32/float64
             ValueError: If nx is less than 1
         """
         if not isinstance(nx, int):
             raise TypeError("nx must be a integer")
         if nx < 1:
             raise ValueError("nx must be positive")
+        if dtype not in ['float32', 'float64', np.float32, np.float64]:
+            raise TypeError("dtype must be float32 or float64")
         
-        self.__W = np.random.randn(1, nx)
+        self.__dtype = np.dtype(dtype)
+        self.__W = np.random.randn(1, nx).astype(self.__dtype)
         self.__b = 0
         self.__A = 0
     
@@ -43,6 +49,11 @@ class Neuron:
         """Return the activated output."""
         return self.__A
     
+    @property
+    def dtype(self):
+        """Return the floating point type of the computations."""
+        return self.__dtype
+    
     def forward_prop(self, X):
         """
         Calculate the forward propagation of the neuron.
@@ -53,6 +64,7 @@ class Neuron:
         Returns:
             The private attribute __A
         """
+        X = X.astype(self.__dtype, copy=False)
         Z = np.matmul(self.__W, X) + self.__b
         self.__A = 1 / (1 + np.exp(-Z))
         return self.__A
@@ -69,6 +81,7 @@ class Neuron:
             The cost
         """
         m = Y.shape[1]
+        Y = Y.astype(self.__dtype, copy=False)
         cost = -np.sum(Y * np.log(A) + (1 - Y) * np.log(1.0000001 - A)) / m
         return cost
     
@@ -77,18 +90,33 @@ class Neuron:
         Evaluate the neuron's predictions.
         
         Args:
-            X: numpy.ndarray with shape (nx, m) containing input data
-            Y: numpy.ndarray with shape (1, m) containing correct labels
+            X: numpy.ndarray with shape (nx, m) containing input data,
+               or a data source yielding (X, Y) batches
+            Y: numpy.ndarray with shape (1, m) containing correct labels,
+               ignored when X is a data source
             
         Returns:
             The neuron's prediction and the cost of the network
         """
+        if not isinstance(X, np.ndarray):
+            predictions = []
+            cost = 0
+            m = 0
+            source = X.ordered() if hasattr(X, 'ordered') else X
+            for X_batch, Y_batch in source:
+                A = self.forward_prop(X_batch)
+                n = Y_batch.shape[1]
+                cost += self.cost(Y_batch, A) * n
+                m += n
+                predictions.append(np.where(A >= 0.5, 1, 0))
+            return np.concatenate(predictions, axis=1), cost / m
+        
         A = self.forward_prop(X)
         cost = self.cost(Y, A)
         prediction = np.where(A >= 0.5, 1, 0)
         return prediction, cost
     
-    def gradient_descent(self, X, Y, A, alpha=0.05):
+    def gradient_descent(self, X, Y, A, alpha=0.05, optimizer=None):
         """
         Calculate one pass of gradient descent on the neuron.
         
@@ -97,28 +125,46 @@ class Neuron:
             Y: numpy.ndarray with shape (1, m) containing correct labels
             A: numpy.ndarray with shape (1, m) containing activated output
             alpha: Learning rate
+            optimizer: Optimizer applying the update in place, or None
+                       for plain gradient descent
         """
         m = Y.shape[1]
+        X = X.astype(self.__dtype, copy=False)
+        Y = Y.astype(self.__dtype, copy=False)
         dZ = A - Y
         dW = np.matmul(dZ, X.T) / m
         db = np.sum(dZ) / m
         
+        if optimizer is not None:
+            params = {'W': self.__W, 'b': self.__b}
+            optimizer.update(params, {'W': dW, 'b': db}, alpha)
+            self.__b = params['b']
+            return
+        
         self.__W = self.__W - alpha * dW
         self.__b = self.__b - alpha * db
     
     def train(self, X, Y, iterations=5000, alpha=0.05,
-              verbose=True, graph=True, step=100):
+              verbose=True, graph=True, step=100, optimizer=None):
         """
         Train the neuron with optional verbose output and graphing.
         
+        When X is a data source, each iteration is one epoch of gradient
+        descent over its batches, and the reported cost is the mean of
+        the batch costs seen during that epoch.
+        
         Args:
-            X: numpy.ndarray with shape (nx, m) containing input data
-            Y: numpy.ndarray with shape (1, m) containing correct labels
+            X: numpy.ndarray with shape (nx, m) containing input data,
+               or a data source yielding (X, Y) batches
+            Y: numpy.ndarray with shape (1, m) containing correct labels,
+               ignored when X is a data source
             iterations: Number of iterations to train over
             alpha: Learning rate
             verbose: Boolean to print information about training
             graph: Boolean to graph information about training
             step: Step interval for output
+            optimizer: Optimizer applying the updates in place, or None
+                       for plain gradient descent
             
         Returns:
             The evaluation of the training data after iterations
@@ -147,9 +193,17 @@ class Neuron:
         costs = []
         steps_list = []
         
+        streaming = not isinstance(X, np.ndarray)
+        
         for i in range(iterations + 1):
-            self.forward_prop(X)
-            cost = self.cost(Y, self.__A)
+            if streaming:
+                if i < iterations:
+                    cost = self.__train_epoch(X, alpha, optimizer)
+                else:
+                    _, cost = self.evaluate(X, Y)
+            else:
+                self.forward_prop(X)
+                cost = self.cost(Y, self.__A)
             
             if verbose and (i % step == 0 or i == iterations):
                 print(f"Cost after {i} iterations: {cost}")
@@ -158,8 +212,8 @@ class Neuron:
                 costs.append(cost)
                 steps_list.append(i)
             
-            if i < iterations:
-                self.gradient_descent(X, Y, self.__A, alpha)
+            if i < iterations and not streaming:
+                self.gradient_descent(X, Y, self.__A, alpha, optimizer)
         
         if graph:
             plt.figure()
@@ -169,4 +223,27 @@ class Neuron:
             plt.title('Training Cost')
             plt.show()
         
-        return self.evaluate(X, Y)
\ No newline at end of file
+        return self.evaluate(X, Y)
+    
+    def __train_epoch(self, source, alpha, optimizer):
+        """
+        Run one epoch of gradient descent over a data source.
+        
+        Args:
+            source: Data source yielding (X, Y) batches
+            alpha: Learning rate
+            optimizer: Optimizer applying the updates, or None
+            
+        Returns:
+            The mean cost of the batches seen during the epoch
+        """
+        cost = 0
+        m = 0
+        for X_batch, Y_batch in source:
+            A = self.forward_prop(X_batch)
+            n = Y_batch.shape[1]
+            cost += self.cost(Y_batch, A) * n
+            m += n
+            self.gradient_descent(X_batch, Y_batch, A, alpha, optimizer)
+        
+        return cost / m